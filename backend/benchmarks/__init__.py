@@ -0,0 +1 @@
+"""Offline benchmark harness for the backend API"""
@@ -0,0 +1,160 @@
+"""
+In-process stand-in for Nango (connection API + proxy) serving generated Jira payloads
+"""
+import asyncio
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+CLOUD_ID = "bench-cloud"
+ACCOUNT_ID = "bench-account"
+
+STATUSES = ["To Do", "In Progress", "In Review", "Done"]
+ISSUE_TYPES = ["Task", "Bug", "Story", "Epic"]
+WORDS = "alpha beta gamma delta epsilon zeta eta theta iota kappa lambda sigma omega".split()
+
+
+EPOCH = datetime(2024, 12, 31, 23, 59)
+
+
+def _timestamp(minutes_ago: int) -> str:
+    return (EPOCH - timedelta(minutes=minutes_ago)).strftime("%Y-%m-%dT%H:%M:%S.000+0000")
+
+
+def generate_issue(index: int, project: Dict[str, str], summary_words: int, rng: random.Random) -> dict:
+    """Generate one raw /search/jql issue"""
+    assignee = None
+    if rng.random() < 0.7:
+        name = rng.choice(WORDS).title()
+        assignee = {
+            "accountId": f"acc-{name.lower()}",
+            "displayName": name,
+            "emailAddress": f"{name.lower()}@example.com",
+            "active": True
+        }
+    key = f"{project['key']}-{index + 1}"
+    return {
+        "id": str(100000 + index),
+        "key": key,
+        "self": f"https://api.atlassian.com/ex/jira/{CLOUD_ID}/rest/api/3/issue/{100000 + index}",
+        "fields": {
+            "summary": " ".join(rng.choice(WORDS) for _ in range(summary_words)),
+            "status": {"name": rng.choice(STATUSES), "id": "1"},
+            "assignee": assignee,
+            "issuetype": {"name": rng.choice(ISSUE_TYPES), "id": "10001", "subtask": False},
+            "project": {"id": project["id"], "key": project["key"], "name": project["name"]},
+            "created": _timestamp(index * 7),
+            "updated": _timestamp(index * 3)
+        }
+    }
+
+
+def create_fake_nango(
+    issues: int = 1000,
+    projects: int = 200,
+    summary_words: int = 8,
+    latency_ms: float = 20.0,
+    jitter_ms: float = 5.0,
+    seed: int = 42
+) -> FastAPI:
+    """
+    Build the fake Nango ASGI app
+
+    Args:
+        issues: Issues per project returned by /search/jql (paged)
+        projects: Total projects returned by project/search (paged)
+        summary_words: Words per generated issue summary (payload size knob)
+        latency_ms: Mean simulated upstream latency per request
+        jitter_ms: Uniform jitter added to the latency
+        seed: Random seed, so runs are comparable between commits
+
+    Returns:
+        ASGI app answering the Nango routes the backend uses
+    """
+    rng = random.Random(seed)
+    project_list = [
+        {"id": str(10000 + i), "key": f"P{i}", "name": f"Project {i}"}
+        for i in range(projects)
+    ]
+    # Payloads are generated once so the fake costs little CPU per request
+    issue_list = [generate_issue(i, project_list[0], summary_words, rng) for i in range(issues)]
+    issue_types = [
+        {"id": str(10000 + i), "name": name, "description": f"A {name.lower()}", "iconUrl": "", "subtask": False}
+        for i, name in enumerate(ISSUE_TYPES)
+    ]
+
+    app = FastAPI()
+    app.state.requests = 0
+
+    async def simulate_latency() -> None:
+        app.state.requests += 1
+        delay = latency_ms + rng.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    @app.get("/connection/{connection_id}")
+    async def get_connection(connection_id: str):
+        await simulate_latency()
+        return {
+            "connection_id": connection_id,
+            "connection_config": {"cloudId": CLOUD_ID, "accountId": ACCOUNT_ID},
+            "credentials": {"type": "OAUTH2", "access_token": "bench-token", "expires_at": "2999-01-01T00:00:00.000Z"}
+        }
+
+    @app.get("/proxy/ex/jira/{cloud_id}/rest/api/3/myself")
+    async def myself(cloud_id: str):
+        await simulate_latency()
+        return {"accountId": ACCOUNT_ID, "emailAddress": "bench@example.com", "displayName": "Bench User", "active": True}
+
+    @app.get("/proxy/ex/jira/{cloud_id}/rest/api/3/project/search")
+    async def project_search(cloud_id: str, startAt: int = 0, maxResults: int = 50):
+        await simulate_latency()
+        page = project_list[startAt:startAt + maxResults]
+        return {
+            "startAt": startAt,
+            "maxResults": maxResults,
+            "total": len(project_list),
+            "isLast": startAt + maxResults >= len(project_list),
+            "values": page
+        }
+
+    @app.get("/proxy/ex/jira/{cloud_id}/rest/api/3/search/jql")
+    async def search(cloud_id: str, maxResults: int = 50, nextPageToken: str = "0"):
+        await simulate_latency()
+        start = int(nextPageToken or 0)
+        body: Dict[str, Any] = {"issues": issue_list[start:start + maxResults]}
+        if start + maxResults < len(issue_list):
+            body["nextPageToken"] = str(start + maxResults)
+        else:
+            body["isLast"] = True
+        return body
+
+    @app.get("/proxy/ex/jira/{cloud_id}/rest/api/3/issuetype/project")
+    async def issuetypes(cloud_id: str, projectId: str = ""):
+        await simulate_latency()
+        return issue_types
+
+    @app.post("/proxy/ex/jira/{cloud_id}/rest/api/3/issue")
+    async def create_issue(cloud_id: str, request: Request):
+        await simulate_latency()
+        app.state.created = getattr(app.state, "created", 0) + 1
+        issue_id = 900000 + app.state.created
+        return JSONResponse(
+            {"id": str(issue_id), "key": f"P0-{issue_id}", "self": f"https://example.invalid/issue/{issue_id}"},
+            status_code=201
+        )
+
+    @app.post("/proxy/ex/jira/{cloud_id}/rest/api/3/issue/bulk")
+    async def create_issues_bulk(cloud_id: str, request: Request):
+        await simulate_latency()
+        body = await request.json()
+        created: List[dict] = []
+        for _ in body.get("issueUpdates", []):
+            app.state.created = getattr(app.state, "created", 0) + 1
+            issue_id = 900000 + app.state.created
+            created.append({"id": str(issue_id), "key": f"P0-{issue_id}", "self": f"https://example.invalid/issue/{issue_id}"})
+        return JSONResponse({"issues": created, "errors": []}, status_code=201)
+
+    return app
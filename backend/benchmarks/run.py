@@ -0,0 +1,225 @@
+"""
+Throughput / latency benchmark for the backend API
+
+Runs the FastAPI app in-process against a fake Nango (benchmarks/fake_nango.py)
+serving generated Jira payloads, drives the API routes at fixed concurrency
+levels and reports req/s and p50/p95/p99 latency. Results are written as JSON
+so runs from different commits can be compared with --compare.
+
+MongoDB must be reachable (the app lifespan and /api/connection use it); a
+separate database (nango_jira_bench) is used by default.
+
+Usage (from backend/):
+    python -m benchmarks.run --concurrency 1,10,50 --requests 500 --output bench.json
+    python -m benchmarks.run --output new.json --compare bench.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+CONNECTION_ID = "bench-connection"
+
+# name -> (method, path, query params, json body)
+ROUTES: Dict[str, Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]] = {
+    "issues": ("GET", f"/api/issues/{CONNECTION_ID}", {"project_key": "P0", "max_results": 50}, None),
+    "projects": ("GET", f"/api/projects/{CONNECTION_ID}", None, None),
+    "issue-types": ("GET", f"/api/issue-types/{CONNECTION_ID}/10000", None, None),
+    "connection": ("POST", "/api/connection", None, {"connectionId": CONNECTION_ID}),
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the backend API against a fake Nango")
+    parser.add_argument("--routes", default=",".join(ROUTES), help="Comma-separated routes: " + ", ".join(ROUTES))
+    parser.add_argument("--concurrency", default="1,10,50", help="Comma-separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=500, help="Requests per route and concurrency level")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per route before measuring")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Simulated upstream latency")
+    parser.add_argument("--jitter-ms", type=float, default=5.0, help="Uniform jitter on the upstream latency")
+    parser.add_argument("--issues", type=int, default=1000, help="Issues served by the fake /search/jql")
+    parser.add_argument("--projects", type=int, default=200, help="Projects served by the fake project/search")
+    parser.add_argument("--summary-words", type=int, default=8, help="Words per generated issue summary")
+    parser.add_argument("--mongodb-url", default=None, help="MongoDB URL (default: MONGODB_URL)")
+    parser.add_argument("--mongodb-db", default="nango_jira_bench", help="MongoDB database for the run")
+    parser.add_argument("--output", default=None, help="Write results JSON to this path")
+    parser.add_argument("--compare", default=None, help="Previous results JSON to compare against")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args: argparse.Namespace) -> None:
+    """Set app settings before config is imported; explicit env vars still win"""
+    if args.mongodb_url:
+        os.environ["MONGODB_URL"] = args.mongodb_url
+    os.environ["MONGODB_DB_NAME"] = args.mongodb_db
+    os.environ.setdefault("NANGO_HOST", "http://fake-nango")
+    os.environ.setdefault("NANGO_SECRET_KEY", "bench")
+    # Measure the app, not the per-connection rate limit, admission control
+    # (shed 503s would inflate req/s) or the sync job
+    os.environ.setdefault("UPSTREAM_RATE", "1000000")
+    os.environ.setdefault("UPSTREAM_BURST", "1000000")
+    os.environ.setdefault("UPSTREAM_MAX_QUEUE", "1000000")
+    os.environ.setdefault("ADMISSION_MAX_CONCURRENCY", "1000000")
+    os.environ.setdefault("ADMISSION_CONNECTION_MAX_CONCURRENCY", "1000000")
+    os.environ.setdefault("ADMISSION_MAX_QUEUE", "1000000")
+    os.environ.setdefault("ADMISSION_CONNECTION_MAX_QUEUE", "1000000")
+    # Result caches would answer most measured requests without doing the
+    # work; set QUERY_CACHE_TTL / ISSUE_TYPES_CACHE_TTL to benchmark them warm
+    os.environ.setdefault("QUERY_CACHE_TTL", "0")
+    os.environ.setdefault("ISSUE_TYPES_CACHE_TTL", "0")
+    os.environ.setdefault("MIRROR_SYNC_INTERVAL", "0")
+    os.environ.setdefault("DEBUG", "false")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[rank]
+
+
+async def run_load(client, route: str, concurrency: int, total: int) -> Dict[str, Any]:
+    """Send `total` requests to a route from `concurrency` workers"""
+    method, path, params, body = ROUTES[route]
+    latencies: List[float] = []
+    errors = 0
+    remaining = total
+
+    async def worker() -> None:
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            started = time.perf_counter()
+            try:
+                response = await client.request(method, path, params=params, json=body)
+                if response.status_code >= 400:
+                    errors += 1
+            except Exception:
+                errors += 1
+            latencies.append((time.perf_counter() - started) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "route": route,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "duration_s": round(duration, 4),
+        "rps": round(len(latencies) / duration, 2) if duration else 0.0,
+        "latency_ms": {
+            "mean": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "max": round(latencies[-1], 3) if latencies else 0.0,
+        },
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    import httpx
+    from main import app
+    from services.nango_service import nango_service
+    from benchmarks.fake_nango import create_fake_nango
+
+    routes = [r.strip() for r in args.routes.split(",") if r.strip()]
+    unknown = [r for r in routes if r not in ROUTES]
+    if unknown:
+        raise SystemExit(f"Unknown routes: {', '.join(unknown)}")
+    levels = [int(c) for c in args.concurrency.split(",") if c.strip()]
+
+    fake = create_fake_nango(
+        issues=args.issues,
+        projects=args.projects,
+        summary_words=args.summary_words,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+    )
+    # Must happen before the lifespan, which would otherwise create the real client
+    await nango_service.startup(transport=httpx.ASGITransport(app=fake))
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            for route in routes:
+                await run_load(client, route, 1, args.warmup)
+                for level in levels:
+                    result = await run_load(client, route, level, args.requests)
+                    results.append(result)
+                    lat = result["latency_ms"]
+                    print(
+                        f"{route:<12} c={level:<4} {result['rps']:>9.1f} req/s  "
+                        f"p50={lat['p50']:>8.2f}ms  p95={lat['p95']:>8.2f}ms  p99={lat['p99']:>8.2f}ms  "
+                        f"errors={result['errors']}"
+                    )
+
+    return {
+        "meta": {
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "git_revision": git_revision(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "upstream_requests": fake.state.requests,
+            "config": {
+                k: v for k, v in vars(args).items() if k not in ("output", "compare", "mongodb_url")
+            },
+        },
+        "results": results,
+    }
+
+
+def compare(current: Dict[str, Any], previous_path: str) -> None:
+    """Print req/s and p95 changes against a previous results file"""
+    with open(previous_path) as f:
+        previous = json.load(f)
+    baseline = {(r["route"], r["concurrency"]): r for r in previous.get("results", [])}
+    print(f"\nCompared with {previous_path} ({previous.get('meta', {}).get('git_revision')}):")
+    for result in current["results"]:
+        old = baseline.get((result["route"], result["concurrency"]))
+        if not old:
+            continue
+        rps_change = (result["rps"] - old["rps"]) / old["rps"] * 100 if old["rps"] else 0.0
+        old_p95 = old["latency_ms"]["p95"]
+        p95_change = (result["latency_ms"]["p95"] - old_p95) / old_p95 * 100 if old_p95 else 0.0
+        print(
+            f"{result['route']:<12} c={result['concurrency']:<4} "
+            f"req/s {rps_change:+7.1f}%   p95 {p95_change:+7.1f}%"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    configure_environment(args)
+    report = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+Per-request CPU cost of mapping + serialising an issue list
+
+Compares the previous path (dict-per-issue mapping, FastAPI's
+jsonable_encoder, stdlib json as in JSONResponse) with the current one
+(slotted records encoded by orjson via OrjsonResponse).
+
+Usage (from backend/):
+    python -m benchmarks.serialization --issues 100 --comments 2 --iterations 2000
+"""
+import argparse
+import json
+import random
+import time
+from typing import Callable, List
+
+from fastapi.encoders import jsonable_encoder
+
+from benchmarks.fake_nango import generate_issue
+from routes.responses import OrjsonResponse
+from services.jira_service import JiraService
+
+
+def legacy_map_issue(issue: dict) -> dict:
+    """The dict-building mapper JiraService used before compact records"""
+    fields = issue.get("fields", {})
+    project = fields.get("project", {})
+    assignee = fields.get("assignee")
+    issue_type = fields.get("issuetype", {})
+    status = fields.get("status", {})
+
+    comments = []
+    if "comment" in fields:
+        comment_data = fields.get("comment", {})
+        for c in comment_data.get("comments", []):
+            author = c.get("author", {})
+            comments.append({
+                "id": c.get("id"),
+                "createdAt": c.get("created"),
+                "updatedAt": c.get("updated"),
+                "author": {
+                    "accountId": author.get("accountId"),
+                    "active": author.get("active", True),
+                    "displayName": author.get("displayName", "Unknown"),
+                    "emailAddress": author.get("emailAddress")
+                },
+                "body": c.get("body", {})
+            })
+
+    return {
+        "id": issue["id"],
+        "key": issue["key"],
+        "summary": fields.get("summary", ""),
+        "issue_type": issue_type.get("name", "Task"),
+        "status": status.get("name", "Unknown"),
+        "assignee": assignee.get("displayName") if assignee else None,
+        "url": issue.get("self", ""),
+        "web_url": f"https://atlassian.net/browse/{issue['key']}",
+        "project_id": project.get("id", ""),
+        "project_key": project.get("key", ""),
+        "project_name": project.get("name", ""),
+        "created_at": fields.get("created", ""),
+        "updated_at": fields.get("updated", ""),
+        "comments": comments
+    }
+
+
+def legacy_render(raw_issues: List[dict]) -> bytes:
+    issues = [legacy_map_issue(issue) for issue in raw_issues]
+    # What FastAPI does for a plain return value with the default JSONResponse
+    content = jsonable_encoder(issues)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def current_render(raw_issues: List[dict]) -> bytes:
+    issues = [JiraService.map_issue(issue) for issue in raw_issues]
+    return OrjsonResponse(issues).body
+
+
+def make_issues(count: int, comments: int, seed: int = 7) -> List[dict]:
+    rng = random.Random(seed)
+    project = {"id": "10000", "key": "P0", "name": "Project 0"}
+    issues = [generate_issue(i, project, 8, rng) for i in range(count)]
+    for issue in issues:
+        if comments:
+            issue["fields"]["comment"] = {"comments": [
+                {
+                    "id": str(n),
+                    "created": issue["fields"]["created"],
+                    "updated": issue["fields"]["updated"],
+                    "author": {"accountId": "acc", "displayName": "Bench", "emailAddress": "b@example.com", "active": True},
+                    "body": {"type": "doc", "version": 1, "content": [
+                        {"type": "paragraph", "content": [{"type": "text", "text": "comment text " * 5}]}
+                    ]},
+                }
+                for n in range(comments)
+            ]}
+    return issues
+
+
+def measure(render: Callable[[List[dict]], bytes], issues: List[dict], iterations: int) -> float:
+    """CPU microseconds per request"""
+    render(issues)
+    started = time.process_time()
+    for _ in range(iterations):
+        render(issues)
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Issue list mapping + serialisation CPU benchmark")
+    parser.add_argument("--issues", type=int, default=100, help="Issues per request")
+    parser.add_argument("--comments", type=int, default=0, help="Inline comments per issue")
+    parser.add_argument("--iterations", type=int, default=2000, help="Requests to simulate")
+    args = parser.parse_args()
+
+    issues = make_issues(args.issues, args.comments)
+    assert json.loads(legacy_render(issues)) == json.loads(current_render(issues)), "outputs differ"
+
+    before = measure(legacy_render, issues, args.iterations)
+    after = measure(current_render, issues, args.iterations)
+    print(f"{args.issues} issues, {args.comments} comments each, {args.iterations} iterations")
+    print(f"before (dicts + jsonable_encoder + json): {before:10.1f} us CPU/request")
+    print(f"after  (records + orjson):               {after:10.1f} us CPU/request")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
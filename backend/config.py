@@ -18,10 +18,91 @@ class Settings:
         self.nango_public_key = os.environ.get("NANGO_PUBLIC_KEY", "")
         self.nango_jira_provider_key = os.environ.get("NANGO_JIRA_PROVIDER_KEY", "jira")
 
+        # Nango HTTP client (shared, pooled connection to the Nango host)
+        self.nango_max_connections = int(os.environ.get("NANGO_MAX_CONNECTIONS", "100"))
+        self.nango_max_keepalive_connections = int(os.environ.get("NANGO_MAX_KEEPALIVE_CONNECTIONS", "20"))
+        self.nango_keepalive_expiry = float(os.environ.get("NANGO_KEEPALIVE_EXPIRY", "30"))
+        self.nango_http2 = os.environ.get("NANGO_HTTP2", "False").lower() == "true"
+        self.nango_connect_timeout = float(os.environ.get("NANGO_CONNECT_TIMEOUT", "5"))
+        self.nango_pool_timeout = float(os.environ.get("NANGO_POOL_TIMEOUT", "5"))
+        self.nango_connection_timeout = float(os.environ.get("NANGO_CONNECTION_TIMEOUT", "10"))
+        self.nango_proxy_timeout = float(os.environ.get("NANGO_PROXY_TIMEOUT", "30"))
+
+        # Upstream scheduling (per-connection token bucket, retries and backoff)
+        self.upstream_rate = float(os.environ.get("UPSTREAM_RATE", "10"))
+        self.upstream_burst = float(os.environ.get("UPSTREAM_BURST", "20"))
+        self.upstream_max_queue = int(os.environ.get("UPSTREAM_MAX_QUEUE", "100"))
+        self.upstream_max_retries = int(os.environ.get("UPSTREAM_MAX_RETRIES", "3"))
+        self.upstream_backoff_base = float(os.environ.get("UPSTREAM_BACKOFF_BASE", "0.5"))
+        self.upstream_backoff_max = float(os.environ.get("UPSTREAM_BACKOFF_MAX", "8"))
+        self.upstream_max_retry_after = float(os.environ.get("UPSTREAM_MAX_RETRY_AFTER", "30"))
+
+        # Direct-to-Jira mode: call api.atlassian.com with the cached OAuth token
+        self.jira_direct_mode = os.environ.get("JIRA_DIRECT_MODE", "False").lower() == "true"
+        self.jira_direct_base_url = os.environ.get("JIRA_DIRECT_BASE_URL", "https://api.atlassian.com")
+        self.jira_token_refresh_margin = float(os.environ.get("JIRA_TOKEN_REFRESH_MARGIN", "120"))
+        self.jira_token_negative_ttl = float(os.environ.get("JIRA_TOKEN_NEGATIVE_TTL", "60"))
+
+        # Admission control (API concurrency limits, wait queue, request deadline)
+        self.admission_max_concurrency = int(os.environ.get("ADMISSION_MAX_CONCURRENCY", "64"))
+        self.admission_connection_max_concurrency = int(os.environ.get("ADMISSION_CONNECTION_MAX_CONCURRENCY", "8"))
+        self.admission_max_queue = int(os.environ.get("ADMISSION_MAX_QUEUE", "128"))
+        self.admission_connection_max_queue = int(os.environ.get("ADMISSION_CONNECTION_MAX_QUEUE", "32"))
+        self.admission_queue_timeout = float(os.environ.get("ADMISSION_QUEUE_TIMEOUT", "5"))
+        self.request_timeout = float(os.environ.get("REQUEST_TIMEOUT", "30"))
+        self.bulk_request_timeout = float(os.environ.get("BULK_REQUEST_TIMEOUT", "300"))
+
+        # Connection metadata cache (cloud_id / account_id lookups)
+        self.connection_cache_ttl = float(os.environ.get("CONNECTION_CACHE_TTL", "300"))
+        self.connection_cache_max_size = int(os.environ.get("CONNECTION_CACHE_MAX_SIZE", "1024"))
+
+        # Jira fan-out (paged listings and batched calls)
+        self.jira_projects_page_size = int(os.environ.get("JIRA_PROJECTS_PAGE_SIZE", "50"))
+        self.jira_max_concurrency = int(os.environ.get("JIRA_MAX_CONCURRENCY", "5"))
+        self.jira_bulk_chunk_size = min(int(os.environ.get("JIRA_BULK_CHUNK_SIZE", "50")), 50)
+
         # MongoDB Configuration
         self.mongodb_url = os.environ.get("MONGODB_URL", "mongodb://localhost:27017")
         self.mongodb_db_name = os.environ.get("MONGODB_DB_NAME", "nango_jira_demo")
 
+        # Connection status (stale-while-revalidate over the connections collection)
+        self.connection_status_fresh_seconds = float(os.environ.get("CONNECTION_STATUS_FRESH_SECONDS", "60"))
+        self.connection_status_stale_seconds = float(os.environ.get("CONNECTION_STATUS_STALE_SECONDS", "86400"))
+        self.connection_ttl_seconds = int(os.environ.get("CONNECTION_TTL_SECONDS", str(90 * 24 * 3600)))
+
+        # Issue query result cache (normalised query -> results, dropped on writes)
+        self.query_cache_ttl = float(os.environ.get("QUERY_CACHE_TTL", "30"))
+        self.query_cache_max_entries = int(os.environ.get("QUERY_CACHE_MAX_ENTRIES", "1000"))
+        self.query_cache_max_bytes = int(os.environ.get("QUERY_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        self.issue_types_cache_ttl = float(os.environ.get("ISSUE_TYPES_CACHE_TTL", "600"))
+
+        # Issue mirror (MongoDB copy of Jira issues, kept current by delta sync)
+        self.mirror_sync_interval = float(os.environ.get("MIRROR_SYNC_INTERVAL", "300"))
+        self.mirror_sync_overlap_minutes = int(os.environ.get("MIRROR_SYNC_OVERLAP_MINUTES", "2"))
+        self.mirror_tombstone_ttl = int(os.environ.get("MIRROR_TOMBSTONE_TTL", str(7 * 24 * 3600)))
+
+        # Jira webhooks (signed with this secret; batched writes into the issue mirror)
+        self.jira_webhook_secret = os.environ.get("JIRA_WEBHOOK_SECRET", "")
+        self.webhook_batch_window = float(os.environ.get("WEBHOOK_BATCH_WINDOW", "0.5"))
+        self.webhook_batch_max_size = int(os.environ.get("WEBHOOK_BATCH_MAX_SIZE", "500"))
+
+        # Live issue feed (Server-Sent Events, one shared poller per project)
+        self.live_feed_poll_interval = float(os.environ.get("LIVE_FEED_POLL_INTERVAL", "15"))
+        self.live_feed_queue_size = int(os.environ.get("LIVE_FEED_QUEUE_SIZE", "100"))
+        self.live_feed_heartbeat = float(os.environ.get("LIVE_FEED_HEARTBEAT", "15"))
+
+        # Background jobs (async issue creation)
+        self.job_workers = int(os.environ.get("JOB_WORKERS", "4"))
+        self.job_poll_interval = float(os.environ.get("JOB_POLL_INTERVAL", "5"))
+        self.job_lease_seconds = float(os.environ.get("JOB_LEASE_SECONDS", "300"))
+        self.job_max_attempts = int(os.environ.get("JOB_MAX_ATTEMPTS", "5"))
+        self.job_retention_seconds = int(os.environ.get("JOB_RETENTION_SECONDS", str(7 * 24 * 3600)))
+
+        # Response compression (brotli when installed, else gzip) above this size
+        self.compression_min_size = int(os.environ.get("COMPRESSION_MIN_SIZE", "1024"))
+        self.gzip_level = int(os.environ.get("GZIP_LEVEL", "6"))
+        self.brotli_quality = int(os.environ.get("BROTLI_QUALITY", "4"))
+
         # Application Settings
         self.api_host = os.environ.get("API_HOST", "0.0.0.0")
         self.api_port = int(os.environ.get("API_PORT", "8000"))
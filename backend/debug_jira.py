@@ -25,5 +25,7 @@ async def test_jira():
         except Exception as e:
             print(f"ERROR: {e}")
 
+    await nango_service.shutdown()
+
 if __name__ == "__main__":
     asyncio.run(test_jira())
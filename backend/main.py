@@ -4,10 +4,21 @@ FastAPI application for interacting with Jira through Nango
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from contextlib import asynccontextmanager
 from motor.motor_asyncio import AsyncIOMotorClient
 from config import get_settings
-from routes.jira_routes import router as jira_router
+from middleware import ConditionalCompressionMiddleware, MetricsMiddleware
+from services.metrics import registry as metrics_registry
+from services.admission import DeadlineExceededError, OverloadedError, admission
+from services.nango_service import nango_service
+from services.rate_limiter import UpstreamBusyError
+from services.issue_mirror import issue_mirror
+from services.connection_status import connection_status
+from services.job_queue import job_queue
+from services.live_feed import live_feed
+from routes.jira_routes import router as jira_router, upstream_error_handler
+from routes.webhook_routes import router as webhook_router
 
 settings = get_settings()
 
@@ -28,11 +39,28 @@ async def lifespan(app: FastAPI):
     # Connect to MongoDB
     mongodb_client = AsyncIOMotorClient(settings.mongodb_url)
     app.state.mongodb = mongodb_client[settings.mongodb_db_name]
+
+    # Shared, pooled HTTP client for Nango
+    await nango_service.startup()
+
+    # Connections indexes (unique connection_id, TTL on verification time)
+    await connection_status.startup(app.state.mongodb)
+
+    # Issue mirror indexes and background delta sync
+    await issue_mirror.startup(app.state.mongodb)
+
+    # Background job workers (async issue creation), resuming unfinished jobs
+    await job_queue.startup(app.state.mongodb)
     
     yield
     
     # Shutdown
     print("Shutting down...")
+    await live_feed.shutdown()
+    await job_queue.shutdown()
+    await issue_mirror.shutdown()
+    await connection_status.shutdown()
+    await nango_service.shutdown()
     mongodb_client.close()
 
 
@@ -59,8 +87,19 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ETag/304 and compression for complete GET responses
+app.add_middleware(ConditionalCompressionMiddleware)
+
+# Request metrics (outermost, so CORS preflights are counted too)
+app.add_middleware(MetricsMiddleware)
+
+# Throttling and deadline errors that escape a route's own error handling
+for error_type in (UpstreamBusyError, OverloadedError, DeadlineExceededError):
+    app.add_exception_handler(error_type, upstream_error_handler)
+
 # Include routers
 app.include_router(jira_router)
+app.include_router(webhook_router)
 
 
 @app.get("/")
@@ -79,10 +118,22 @@ async def health_check():
     return {
         "status": "healthy",
         "nango_host": settings.nango_host,
-        "mongodb_connected": mongodb_client is not None
+        "mongodb_connected": mongodb_client is not None,
+        "upstream_queue_depth": nango_service.scheduler.queue_depth(),
+        "upstream_queue_depths": nango_service.scheduler.queue_depths(),
+        "admission": admission.stats()
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics: route/upstream/Mongo latency, in-flight gauges, cache hit ratios, admission queue and shedding"""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -0,0 +1,207 @@
+"""
+ASGI middleware for the API
+"""
+import gzip
+import hashlib
+import time
+from typing import List, Optional, Tuple
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from config import get_settings
+from services.metrics import HTTP_IN_FLIGHT, HTTP_LATENCY, HTTP_REQUESTS, RESPONSE_BYTES
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+settings = get_settings()
+
+# Content types worth compressing (prefix match on the media type)
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+
+class MetricsMiddleware:
+    """
+    Records per-route request counts, latency and in-flight requests
+
+    Written as plain ASGI (not BaseHTTPMiddleware) so it adds no extra task
+    or body buffering per request. Routes are labelled by their path template
+    (e.g. /api/issues/{connection_id}) to keep label cardinality bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            method = scope["method"]
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, path)
+            HTTP_REQUESTS.inc(method, path, status)
+
+
+def _accepted_encodings(header: str) -> List[Tuple[str, float]]:
+    """Parse Accept-Encoding into (coding, q) pairs"""
+    accepted = []
+    for part in header.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted.append((coding.strip().lower(), q))
+    return accepted
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br (when brotli is installed) or gzip from an Accept-Encoding header"""
+    accepted = dict(_accepted_encodings(accept_encoding))
+    wildcard = accepted.get("*", 0.0)
+    for coding in ("br", "gzip") if brotli is not None else ("gzip",):
+        if accepted.get(coding, wildcard) > 0:
+            return coding
+    return None
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of If-None-Match against an ETag"""
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+class ConditionalCompressionMiddleware:
+    """
+    Adds ETags, answers If-None-Match with 304, and compresses responses
+
+    Applies to complete (single-message) GET/HEAD responses only: streamed
+    bodies (NDJSON, SSE, exports) and responses that already carry a
+    Content-Encoding are passed through untouched.
+
+    JSON responses get a weak ETag hashed from the body and
+    `Cache-Control: no-cache`, so browsers revalidate every poll and an
+    unchanged one is answered with an empty 304. Cached query results reuse
+    their encoding (RecordList), so such a poll costs only the hash. Bodies
+    of at least COMPRESSION_MIN_SIZE bytes are compressed with brotli (if
+    installed) or gzip, as negotiated by Accept-Encoding.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            if message.get("more_body", False):
+                # Streaming response: send it as is
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            await self._send_complete(start, message.get("body", b""), request_headers, send)
+
+        await self.app(scope, receive, send_wrapper)
+
+    async def _send_complete(
+        self,
+        start: Message,
+        body: bytes,
+        request_headers: Headers,
+        send: Send
+    ) -> None:
+        headers = MutableHeaders(raw=list(start["headers"]))
+        status = start["status"]
+        media_type = headers.get("content-type", "").split(";")[0].strip()
+
+        if status != 200 or "content-encoding" in headers:
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        if media_type == "application/json" and "etag" not in headers:
+            headers["etag"] = 'W/"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+            if "cache-control" not in headers:
+                headers["cache-control"] = "no-cache"
+
+        compressible = media_type.startswith(COMPRESSIBLE_TYPES)
+        if compressible:
+            headers.add_vary_header("Accept-Encoding")
+
+        etag = headers.get("etag")
+        if_none_match = request_headers.get("if-none-match")
+        if etag and if_none_match and etag_matches(if_none_match, etag):
+            not_modified = MutableHeaders()
+            for name in ("etag", "cache-control", "vary", "access-control-allow-origin", "access-control-allow-credentials"):
+                if name in headers:
+                    not_modified[name] = headers[name]
+            RESPONSE_BYTES.inc("not_modified", amount=len(body))
+            await send({"type": "http.response.start", "status": 304, "headers": not_modified.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        encoding = None
+        if compressible and len(body) >= settings.compression_min_size:
+            encoding = choose_encoding(request_headers.get("accept-encoding", ""))
+
+        if encoding:
+            original = len(body)
+            if encoding == "br":
+                body = brotli.compress(body, quality=settings.brotli_quality)
+            else:
+                body = gzip.compress(body, compresslevel=settings.gzip_level, mtime=0)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(body))
+            RESPONSE_BYTES.inc("compression_saved", amount=original - len(body))
+
+        await send({"type": "http.response.start", "status": status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": body})
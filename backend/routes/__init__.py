@@ -1,4 +1,5 @@
 """Routes package initialization"""
 from routes.jira_routes import router as jira_router
+from routes.webhook_routes import router as webhook_router
 
-__all__ = ["jira_router"]
+__all__ = ["jira_router", "webhook_router"]
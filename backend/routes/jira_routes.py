@@ -1,13 +1,104 @@
 """
 API routes for Jira operations
 """
-from fastapi import APIRouter, HTTPException, Query, Request
-from typing import Optional, List, Dict, Any
+import asyncio
+import csv
+import io
+import math
+import re
+import time
+import zlib
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.exception_handlers import http_exception_handler
+from fastapi.responses import Response, StreamingResponse
+from typing import AsyncIterator, Optional, List, Dict, Any, Tuple
 from datetime import datetime
+from services.admission import DeadlineExceededError, OverloadedError, admission, request_deadline, time_remaining
 from services.nango_service import nango_service
-from services.jira_service import jira_service
+from services.jira_service import jira_service, is_issue_key, InvalidIssueRequestError, MAX_COMMENT_ISSUE_KEYS
+from services.issue_mirror import issue_mirror, MIRRORED_FIELDS, FACET_FIELDS
+from services.records import IssueRecord, Record
+from services.connection_status import connection_status
+from services.job_queue import job_queue, IdempotencyConflictError
+from services.live_feed import live_feed
+from services.rate_limiter import UpstreamBusyError
+from services.metrics import MONGO_LATENCY
+from config import get_settings
+from routes.responses import OrjsonResponse, ndjson_line, sse_event
 
-router = APIRouter(prefix="/api", tags=["jira"])
+settings = get_settings()
+
+
+async def _admit(request: Request) -> AsyncIterator[None]:
+    """
+    Router dependency: hold an admission slot and set the request deadline
+
+    Requests are limited per `connection_id` path parameter as well as
+    globally. The slot and deadline end when the endpoint returns, so for
+    streaming responses they cover the setup, not the stream itself.
+    """
+    connection_id = request.path_params.get("connection_id")
+    deadline = time.monotonic() + settings.request_timeout
+    try:
+        await admission.acquire(connection_id, timeout=min(settings.admission_queue_timeout, settings.request_timeout))
+    except OverloadedError as e:
+        raise _upstream_error(e)
+    token = request_deadline.set(deadline)
+    started = time.monotonic()
+    try:
+        yield
+    finally:
+        request_deadline.reset(token)
+        admission.record_hold_time(time.monotonic() - started)
+        admission.release(connection_id)
+
+
+router = APIRouter(prefix="/api", tags=["jira"], dependencies=[Depends(_admit)])
+
+
+def _upstream_error(e: Exception) -> HTTPException:
+    """
+    Translate an upstream failure into the HTTPException sent to the client
+
+    Throttling (our own queues or a Jira 429/503 that outlasted the retries)
+    is passed through with Retry-After so clients can back off, and running
+    out the request deadline is a 504; anything else stays a 500.
+    """
+    if isinstance(e, HTTPException):
+        return e
+    if isinstance(e, OverloadedError):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    if isinstance(e, DeadlineExceededError):
+        return HTTPException(status_code=504, detail=str(e))
+    if isinstance(e, UpstreamBusyError):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, math.ceil(e.retry_after)))}
+        )
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code in (429, 503):
+        retry_after = e.response.headers.get("Retry-After")
+        return HTTPException(
+            status_code=e.response.status_code,
+            detail="Jira is rate limiting requests for this connection",
+            headers={"Retry-After": retry_after} if retry_after else None
+        )
+    return HTTPException(status_code=500, detail=str(e))
+
+
+async def upstream_error_handler(request: Request, exc: Exception) -> Response:
+    """
+    App exception handler for throttling and deadline errors raised outside
+    a route's try block (e.g. by the cloud ID lookup), answered like
+    _upstream_error instead of as a bare 500
+    """
+    return await http_exception_handler(request, _upstream_error(exc))
 
 
 @router.post("/connection")
@@ -20,12 +111,17 @@ async def save_connection(request: Request, data: Dict[str, Any]):
         raise HTTPException(status_code=400, detail="Missing connectionId")
     
     try:
+        # Re-registration may come with new credentials or a different site
+        nango_service.invalidate_connection(connection_id)
+
         # Verify with Nango
         connection = await nango_service.get_connection(connection_id)
         if not connection:
             raise HTTPException(status_code=404, detail="Connection not found in Nango")
 
         config = connection.get("connection_config", {})
+        if config:
+            nango_service.cache_connection_config(connection_id, config)
         cloud_id = config.get("cloudId")
         account_id = config.get("accountId")
         
@@ -40,21 +136,29 @@ async def save_connection(request: Request, data: Dict[str, Any]):
 
         # Save to MongoDB
         db = request.app.state.mongodb
+        now = datetime.utcnow()
         connection_doc = {
             "connection_id": connection_id,
             "provider": "jira",
+            "connected": True,
             "cloud_id": cloud_id,
             "account_id": account_id,
             "user_email": user_email,
             "user_name": user_name,
-            "updated_at": datetime.utcnow()
+            "updated_at": now,
+            "verified_at": now
         }
 
-        await db.connections.update_one(
-            {"connection_id": connection_id},
-            {"$set": connection_doc, "$setOnInsert": {"created_at": datetime.utcnow()}},
-            upsert=True
-        )
+        with MONGO_LATENCY.time("connections.update_one"):
+            await db.connections.update_one(
+                {"connection_id": connection_id},
+                {
+                    "$set": connection_doc,
+                    "$unset": {"error": ""},
+                    "$setOnInsert": {"created_at": now}
+                },
+                upsert=True
+            )
         
         return {
             "connected": True,
@@ -69,51 +173,15 @@ async def save_connection(request: Request, data: Dict[str, Any]):
 
 
 @router.get("/connection/{connection_id}")
-async def get_connection_status(request: Request, connection_id: str):
+async def get_connection_status(connection_id: str):
     """
     Check the status of a Jira connection
+
+    Answered from the stored connection document while it is fresh; stale
+    documents are returned immediately and revalidated in the background.
     """
     try:
-        # First check MongoDB
-        db = request.app.state.mongodb
-        stored_conn = await db.connections.find_one({"connection_id": connection_id})
-        
-        # Even if stored, verify with Nango to ensure it's still alive
-        connection = await nango_service.get_connection(connection_id)
-        
-        if not connection:
-            return {
-                "connected": False,
-                "connection_id": connection_id,
-                "error": "Connection not found in Nango"
-            }
-        
-        config = connection.get("connection_config", {})
-        cloud_id = config.get("cloudId")
-        
-        # If not in MongoDB but valid in Nango, we should probably return it as valid
-        # but the frontend will be prompted to "register" it if it wants persistence
-        
-        user_email = stored_conn.get("user_email") if stored_conn else None
-        user_name = stored_conn.get("user_name") if stored_conn else None
-        
-        if not user_email and cloud_id:
-            try:
-                user = await jira_service.get_myself(connection_id, cloud_id)
-                if user:
-                    user_email = user["email_address"]
-                    user_name = user["display_name"]
-            except Exception:
-                pass
-        
-        return {
-            "connected": True,
-            "connection_id": connection_id,
-            "cloud_id": cloud_id,
-            "account_id": config.get("accountId"),
-            "user_email": user_email,
-            "user_name": user_name
-        }
+        return await connection_status.get_status(connection_id)
     except Exception as e:
         return {
             "connected": False,
@@ -122,7 +190,87 @@ async def get_connection_status(request: Request, connection_id: str):
         }
 
 
-@router.get("/projects/{connection_id}")
+@router.get("/dashboard/{connection_id}", response_class=OrjsonResponse)
+async def get_dashboard(
+    connection_id: str,
+    project_key: Optional[str] = Query(None, description="Project to load issues and issue types for (default: first project)"),
+    project_id: Optional[str] = Query(None, description="Id of project_key, saves waiting for the project list"),
+    max_results: int = Query(50, ge=1, le=100, description="Maximum issues"),
+    fields: Optional[str] = Query(None, description="Comma-separated issue output fields, e.g. summary,status")
+):
+    """
+    Everything the main screen needs in one request
+
+    The connection is resolved once; projects, issues and issue types are
+    then fetched concurrently. A failing section is returned empty with its
+    error under "errors" instead of failing the whole response. Issues and
+    issue types wait for the project list only when they need it to pick
+    the project (no project_key, or no project_id for issue types).
+
+    Returns:
+        {"connection", "project_key", "projects", "issues", "issue_types", "errors"}
+    """
+    try:
+        fieldset = jira_service.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    dashboard: Dict[str, Any] = {
+        "connection": None,
+        "project_key": project_key,
+        "projects": [],
+        "issues": [],
+        "issue_types": [],
+        "errors": {}
+    }
+    try:
+        status = await connection_status.get_status(connection_id)
+    except Exception as e:
+        status = {"connected": False, "connection_id": connection_id, "error": str(e)}
+    dashboard["connection"] = status
+    if not status.get("connected"):
+        return OrjsonResponse(dashboard)
+
+    cloud_id = status.get("cloud_id") or await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    projects_task = asyncio.ensure_future(jira_service.get_projects(connection_id, cloud_id))
+
+    async def selected_project() -> Tuple[Optional[str], Optional[str]]:
+        if project_key and project_id:
+            return project_key, project_id
+        projects = await projects_task
+        match = next((p for p in projects if not project_key or p.key == project_key), None)
+        return (match.key, match.id) if match else (project_key, project_id)
+
+    async def issues() -> List[Any]:
+        key = project_key or (await selected_project())[0]
+        if not key:
+            return []
+        dashboard["project_key"] = key
+        return await jira_service.get_issues(
+            connection_id, cloud_id, project_key=key, max_results=max_results, fields=fieldset
+        )
+
+    async def issue_types() -> List[dict]:
+        _, selected_id = await selected_project()
+        if not selected_id:
+            return []
+        return await jira_service.get_issue_types(connection_id, cloud_id, selected_id)
+
+    sections = ("projects", "issues", "issue_types")
+    results = await asyncio.gather(projects_task, issues(), issue_types(), return_exceptions=True)
+    for section, result in zip(sections, results):
+        if isinstance(result, Exception):
+            error = _upstream_error(result)
+            dashboard["errors"][section] = {"status": error.status_code, "detail": error.detail}
+        else:
+            dashboard[section] = result
+    return OrjsonResponse(dashboard)
+
+
+@router.get("/projects/{connection_id}", response_class=OrjsonResponse)
 async def get_projects(connection_id: str):
     """
     Fetch all Jira projects for a connection
@@ -137,39 +285,388 @@ async def get_projects(connection_id: str):
     if not cloud_id:
         raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
     
-    projects = await jira_service.get_projects(connection_id, cloud_id)
-    return projects
+    try:
+        return OrjsonResponse(await jira_service.get_projects(connection_id, cloud_id))
+    except Exception as e:
+        raise _upstream_error(e)
 
 
-@router.get("/issues/{connection_id}")
+@router.get("/issues/{connection_id}", response_class=OrjsonResponse)
 async def get_issues(
     connection_id: str,
     project_key: Optional[str] = Query(None, description="Filter by project key"),
+    project_keys: Optional[str] = Query(None, description="Comma-separated project keys, merged newest first"),
     max_results: int = Query(50, ge=1, le=100, description="Maximum results"),
-    jql: Optional[str] = Query(None, description="JQL query string")
+    jql: Optional[str] = Query(None, description="JQL query string"),
+    source: str = Query("live", pattern="^(live|mirror)$", description="Read live from Jira or from the local mirror"),
+    fields: Optional[str] = Query(None, description="Comma-separated output fields, e.g. summary,status,labels")
 ):
     """
     Fetch Jira issues
+
+    With fields=..., only those output fields are requested from Jira and
+    mapped (id and key are always included).
+
+    With source=mirror and a project_key, issues are read from the local
+    MongoDB mirror once the project has been synced. Until then the request
+    is served live and a first sync is started in the background.
+
+    With project_keys=A,B,C, each project is searched concurrently and the
+    results merged by creation time (newest first) up to max_results.
     """
+    try:
+        fieldset = jira_service.parse_fields(fields)
+        jira_service.validate_jql(jql)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    keys = [key.strip() for key in (project_keys or "").split(",") if key.strip()]
+    if keys:
+        keys = list(dict.fromkeys(([project_key] if project_key else []) + keys))
+        if len(keys) == 1:
+            project_key, keys = keys[0], []
+        else:
+            project_key = None
+
+    mirror_has_fields = fieldset is None or MIRRORED_FIELDS.issuperset(fieldset)
+    if source == "mirror" and project_key and not jql and mirror_has_fields:
+        with MONGO_LATENCY.time("issues.find"):
+            if await issue_mirror.is_mirrored(connection_id, project_key):
+                return OrjsonResponse(
+                    await issue_mirror.find_issues(connection_id, project_key, max_results, fieldset)
+                )
+        issue_mirror.sync_project(connection_id, project_key)
+
     cloud_id = await nango_service.get_cloud_id(connection_id)
     if not cloud_id:
         raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
     
     try:
+        if keys:
+            issues = await jira_service.get_issues_for_projects(
+                connection_id,
+                cloud_id,
+                keys,
+                max_results=max_results,
+                jql=jql,
+                fields=fieldset
+            )
+            return OrjsonResponse(issues)
+
         issues = await jira_service.get_issues(
             connection_id, 
             cloud_id, 
             project_key=project_key,
             max_results=max_results,
-            jql=jql
+            jql=jql,
+            fields=fieldset
         )
-        return issues
+        return OrjsonResponse(issues)
+    except Exception as e:
+        # Rethrow so frontend knows something went wrong
+        raise _upstream_error(e)
+
+
+@router.get("/search/{connection_id}", response_class=OrjsonResponse)
+async def search_issues(
+    connection_id: str,
+    q: Optional[str] = Query(None, description="Search text"),
+    match: str = Query("text", pattern="^(text|prefix)$", description="Full-text (summary, description) or prefix (key, summary) matching"),
+    project_key: Optional[List[str]] = Query(None, description="Filter by project key (repeatable)"),
+    status: Optional[List[str]] = Query(None, description="Filter by status (repeatable)"),
+    assignee: Optional[List[str]] = Query(None, description="Filter by assignee display name (repeatable)"),
+    issue_type: Optional[List[str]] = Query(None, description="Filter by issue type (repeatable)"),
+    max_results: int = Query(20, ge=1, le=100, description="Maximum results"),
+    fields: Optional[str] = Query(None, description="Comma-separated output fields, e.g. summary,status"),
+    facets: bool = Query(True, description="Include total and per-field facet counts")
+):
+    """
+    Search the local issue mirror (no Jira round trip)
+
+    Only projects synced into the mirror (POST /api/sync) are searched.
+    match=prefix is meant for typeahead: every word of q must start a word
+    of the issue key or summary.
+    """
+    try:
+        fieldset = jira_service.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if fieldset is not None and not MIRRORED_FIELDS.issuperset(fieldset):
+        unavailable = ", ".join(sorted(set(fieldset) - MIRRORED_FIELDS))
+        raise HTTPException(status_code=400, detail=f"Fields not available in the mirror: {unavailable}")
+
+    filters = dict(zip(FACET_FIELDS, (status, assignee, issue_type, project_key)))
+    try:
+        return OrjsonResponse(await issue_mirror.search(
+            connection_id,
+            q=q,
+            match=match,
+            filters=filters,
+            max_results=max_results,
+            fields=fieldset,
+            facets=facets
+        ))
     except Exception as e:
-        # Rethrow as 500 so frontend knows something went wrong
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/issue-types/{connection_id}/{project_id}")
+@router.post("/sync/{connection_id}")
+async def sync_issues(connection_id: str, project_key: str = Query(..., description="Project key to mirror")):
+    """
+    Run an incremental sync of a project into the local issue mirror
+
+    The first sync copies the whole project; later ones only fetch issues
+    updated since the stored watermark. The project is then kept current
+    by the background sync job.
+
+    The sync runs in the background and is awaited only until the request
+    deadline; if it is still running then, 202 is returned and it carries on.
+    """
+    task = issue_mirror.sync_project(connection_id, project_key)
+    remaining = time_remaining()
+    try:
+        return await asyncio.wait_for(asyncio.shield(task), None if remaining is None else max(0.0, remaining))
+    except asyncio.TimeoutError as e:
+        if task.done():
+            raise _upstream_error(e)
+        return OrjsonResponse(
+            {"status": "running", "connection_id": connection_id, "project_key": project_key},
+            status_code=202
+        )
+    except Exception as e:
+        raise _upstream_error(e)
+
+
+@router.get("/issues/{connection_id}/stream")
+async def stream_issues(
+    connection_id: str,
+    project_key: Optional[str] = Query(None, description="Filter by project key"),
+    jql: Optional[str] = Query(None, description="JQL query string"),
+    page_size: int = Query(100, ge=1, le=100, description="Issues per upstream page"),
+    fields: Optional[str] = Query(None, description="Comma-separated output fields, e.g. summary,status")
+):
+    """
+    Stream every matching Jira issue as NDJSON (one issue per line)
+
+    Pages are written as they arrive from Jira. If the upstream fails
+    mid-stream, a final {"error": ...} line is written instead.
+    """
+    try:
+        fieldset = jira_service.parse_fields(fields)
+        jira_service.validate_jql(jql)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cloud_id = await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        pages = jira_service.iter_issue_pages(
+            connection_id,
+            cloud_id,
+            project_key=project_key,
+            jql=jql,
+            page_size=page_size,
+            fields=fieldset
+        )
+        try:
+            async for page in pages:
+                yield b"".join(ndjson_line(issue) for issue in page)
+        except Exception as e:
+            yield ndjson_line({"error": str(e)})
+        finally:
+            await pages.aclose()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+# Default export columns: the issue shape minus nested comments
+EXPORT_COLUMNS = tuple(name for name in IssueRecord.__slots__ if name != "comments")
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (list, dict, Record)):
+        return orjson.dumps(value).decode()
+    return value
+
+
+@router.get("/export/{connection_id}")
+async def export_issues(
+    connection_id: str,
+    project_key: Optional[str] = Query(None, description="Filter by project key"),
+    jql: Optional[str] = Query(None, description="JQL query string"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+    compression: str = Query("none", pattern="^(none|gzip)$", description="none or gzip"),
+    fields: Optional[str] = Query(None, description="Comma-separated output fields (also the CSV columns)"),
+    page_size: int = Query(100, ge=1, le=100, description="Issues per upstream page")
+):
+    """
+    Export every matching issue as a downloadable NDJSON or CSV file
+
+    Issues are paged from Jira, mapped like GET /api/issues, encoded and
+    (optionally) gzip-compressed one page at a time, so memory stays bounded
+    by the page size for any number of issues. If the upstream fails part
+    way, a final error line is written (an {"error": ...} object for NDJSON,
+    an "#error" row for CSV).
+    """
+    try:
+        fieldset = jira_service.parse_fields(fields)
+        jira_service.validate_jql(jql)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    cloud_id = await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    columns = fieldset or EXPORT_COLUMNS
+
+    def encode_ndjson(page: List[Any]) -> bytes:
+        return b"".join(ndjson_line(issue) for issue in page)
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def encode_csv(page: List[Any]) -> bytes:
+        for issue in page:
+            row = issue.to_dict() if isinstance(issue, Record) else issue
+            writer.writerow([_csv_value(row.get(column)) for column in columns])
+        data = buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+        return data
+
+    encode = encode_csv if export_format == "csv" else encode_ndjson
+
+    async def encoded() -> AsyncIterator[bytes]:
+        if export_format == "csv":
+            writer.writerow(columns)
+            yield encode([])
+        pages = jira_service.iter_issue_pages(
+            connection_id,
+            cloud_id,
+            project_key=project_key,
+            jql=jql,
+            page_size=page_size,
+            fields=fieldset
+        )
+        try:
+            async for page in pages:
+                yield encode(page)
+        except Exception as e:
+            if export_format == "csv":
+                writer.writerow(["#error", str(e)])
+                yield encode([])
+            else:
+                yield ndjson_line({"error": str(e)})
+        finally:
+            await pages.aclose()
+
+    async def gzipped() -> AsyncIterator[bytes]:
+        # wbits=31: gzip container, so the download is a regular .gz file
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+        inner = encoded()
+        try:
+            async for chunk in inner:
+                data = compressor.compress(chunk)
+                if data:
+                    yield data
+        finally:
+            await inner.aclose()
+        yield compressor.flush()
+
+    filename = f"{re.sub(r'[^A-Za-z0-9_-]', '_', project_key or 'issues')}-export.{export_format}"
+    media_type = EXPORT_MEDIA_TYPES[export_format]
+    body = encoded()
+    if compression == "gzip":
+        filename += ".gz"
+        media_type = "application/gzip"
+        body = gzipped()
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+@router.get("/issues/{connection_id}/live")
+async def live_issues(
+    connection_id: str,
+    project_key: str = Query(..., description="Project to follow")
+):
+    """
+    Server-Sent Events feed of issue changes in a project
+
+    All clients following the same project share one upstream poller. Events:
+    `issue` (a new or updated issue, same shape as GET /api/issues), `resync`
+    (events were dropped for this slow client; reload the list), `error`
+    (a poll failed; the feed keeps retrying) and `ready` once subscribed.
+    """
+    cloud_id = await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    async def events() -> AsyncIterator[bytes]:
+        channel, subscriber = live_feed.subscribe(connection_id, cloud_id, project_key)
+        try:
+            yield sse_event("ready", {"project_key": project_key})
+            while True:
+                event = await subscriber.next_event(settings.live_feed_heartbeat)
+                if event is None:
+                    return
+                name, data = event
+                yield b": keep-alive\n\n" if name == "heartbeat" else sse_event(name, data)
+        finally:
+            live_feed.unsubscribe(channel, subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/issues/{connection_id}/comments")
+async def stream_comments(connection_id: str, data: Dict[str, Any]):
+    """
+    Stream comments for a list of issues as NDJSON (one issue per line)
+
+    Body: {"issueKeys": ["PROJ-1", "PROJ-2", ...]} with at most
+    MAX_COMMENT_ISSUE_KEYS issue keys or numeric ids. Issues are loaded
+    concurrently (bounded) and written as each completes, so the UI can
+    fill comments in lazily without slowing the main issue list.
+    """
+    issue_keys = data.get("issueKeys")
+    if not isinstance(issue_keys, list) or not issue_keys:
+        raise HTTPException(status_code=400, detail="Missing issueKeys")
+    if len(issue_keys) > MAX_COMMENT_ISSUE_KEYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_COMMENT_ISSUE_KEYS} issueKeys per request")
+    invalid = [key for key in issue_keys if not is_issue_key(key)]
+    if invalid:
+        raise HTTPException(status_code=400, detail=f"Invalid issue keys: {invalid[:5]}")
+
+    cloud_id = await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    async def ndjson() -> AsyncIterator[bytes]:
+        results = jira_service.iter_comments(connection_id, cloud_id, issue_keys)
+        try:
+            async for result in results:
+                yield ndjson_line(result)
+        finally:
+            await results.aclose()
+
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+@router.get("/issue-types/{connection_id}/{project_id}", response_class=OrjsonResponse)
 async def get_issue_types(connection_id: str, project_id: str):
     """
     Fetch issue types for a project
@@ -185,8 +682,10 @@ async def get_issue_types(connection_id: str, project_id: str):
     if not cloud_id:
         raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
     
-    issue_types = await jira_service.get_issue_types(connection_id, cloud_id, project_id)
-    return issue_types
+    try:
+        return OrjsonResponse(await jira_service.get_issue_types(connection_id, cloud_id, project_id))
+    except Exception as e:
+        raise _upstream_error(e)
 
 
 
@@ -195,17 +694,44 @@ async def get_issue_types(connection_id: str, project_id: str):
 
 
 @router.post("/issues/{connection_id}")
-async def create_issue(connection_id: str, request: dict):
+async def create_issue(
+    connection_id: str,
+    request: dict,
+    run_async: bool = Query(False, alias="async", description="Queue a background job and return 202"),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
     """
     Create a new Jira issue
     
     Args:
         connection_id: The Nango connection identifier
         request: Issue creation details
+        run_async: Queue the creation as a job instead of waiting for Jira
+        idempotency_key: With async, retries using the same key return the
+            original job instead of queueing a duplicate
         
     Returns:
-        Created issue details
+        Created issue details, or (async) 202 with the job status
     """
+    if run_async:
+        # Reject what the worker would certainly fail, before a key is spent on it
+        try:
+            jira_service.validate_issue_request(request)
+        except InvalidIssueRequestError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        try:
+            job, created = await job_queue.enqueue(connection_id, request, idempotency_key)
+        except IdempotencyConflictError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        return OrjsonResponse(
+            job_queue.job_status(job),
+            status_code=202,
+            headers={
+                "Location": f"/api/jobs/{job['_id']}",
+                "Idempotent-Replayed": "false" if created else "true"
+            }
+        )
+
     cloud_id = await nango_service.get_cloud_id(connection_id)
     if not cloud_id:
         raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
@@ -215,5 +741,58 @@ async def create_issue(connection_id: str, request: dict):
         if not result:
             raise HTTPException(status_code=500, detail="Failed to create issue")
         return result
+    except InvalidIssueRequestError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise _upstream_error(e)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Get the status of a background job
+
+    Returns:
+        Job status (queued, running, succeeded, failed), attempts, the
+        created issue key and result once succeeded, or the last error
+    """
+    job = await job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return OrjsonResponse(job_queue.job_status(job))
+
+
+@router.post("/issues/{connection_id}/bulk")
+async def create_issues_bulk(connection_id: str, requests: List[Dict[str, Any]]):
+    """
+    Create many Jira issues in chunked /issue/bulk calls
+
+    Args:
+        connection_id: The Nango connection identifier
+        requests: List of issue creation details (same shape as the single create)
+
+    Returns:
+        Per-item results in request order, plus created/failed/unknown counts.
+        Items whose chunk may have reached Jira without an answer (e.g. it
+        timed out or the gateway answered 5xx) are "unknown": check for them
+        before retrying.
+    """
+    if not requests:
+        raise HTTPException(status_code=400, detail="No issues to create")
+
+    cloud_id = await nango_service.get_cloud_id(connection_id)
+    if not cloud_id:
+        raise HTTPException(status_code=400, detail="Could not get Jira Cloud ID")
+
+    # Creates are not idempotent, so a batch gets its own deadline
+    # (BULK_REQUEST_TIMEOUT, 0 for none) instead of the request's
+    timeout = settings.bulk_request_timeout
+    token = request_deadline.set(time.monotonic() + timeout if timeout > 0 else None)
+    try:
+        results = await jira_service.create_issues_bulk(connection_id, cloud_id, requests)
+    finally:
+        request_deadline.reset(token)
+    counts = {"created": 0, "failed": 0, "unknown": 0}
+    for result in results:
+        counts[result["status"]] += 1
+    return {**counts, "results": results}
@@ -0,0 +1,34 @@
+"""
+Response classes for the API routes
+"""
+from typing import Any
+import orjson
+from fastapi.responses import JSONResponse
+from services.records import RecordList
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    JSON response encoded straight to bytes with orjson
+
+    orjson serialises the slotted records from services/records.py natively.
+    Routes should return an instance of this class rather than the raw value:
+    returning the value makes FastAPI run it through jsonable_encoder first,
+    which is the cost this class exists to avoid. Cached RecordList results
+    are encoded once and the bytes reused.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, RecordList):
+            return content.json()
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def ndjson_line(content: Any) -> bytes:
+    """Encode one NDJSON line"""
+    return orjson.dumps(content, option=orjson.OPT_APPEND_NEWLINE)
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    """Encode one Server-Sent Events message (data as a single JSON line)"""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
@@ -0,0 +1,84 @@
+"""
+API routes for Jira webhook ingestion
+"""
+import hashlib
+import hmac
+import orjson
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from typing import Optional
+from config import get_settings
+from services.jira_service import jira_service
+from services.issue_mirror import issue_mirror, MIRROR_FIELDS
+
+settings = get_settings()
+
+router = APIRouter(prefix="/api/webhooks", tags=["webhooks"])
+
+ISSUE_EVENTS = {"jira:issue_created", "jira:issue_updated", "jira:issue_deleted"}
+
+
+def webhook_signature(secret: str, body: bytes) -> str:
+    """X-Hub-Signature value Jira sends for a webhook registered with `secret`"""
+    return "sha256=" + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+
+
+def _is_nonempty_str(value: object) -> bool:
+    return isinstance(value, str) and bool(value)
+
+
+@router.post("/jira", status_code=202)
+async def receive_jira_webhook(
+    request: Request,
+    connection_id: str = Query(..., description="Connection the webhook was registered for"),
+    x_hub_signature: Optional[str] = Header(None, description="sha256=<HMAC of the body with JIRA_WEBHOOK_SECRET>")
+):
+    """
+    Apply a Jira issue webhook to the local issue mirror
+
+    Register the webhook URL as /api/webhooks/jira?connection_id=<id> with
+    JIRA_WEBHOOK_SECRET as its secret; Jira then signs each delivery in
+    X-Hub-Signature, and unsigned or mis-signed deliveries are rejected.
+    Webhooks are disabled while no secret is configured. Writes are buffered
+    and flushed in bulk after a short coalescing window, so the mirror
+    reflects the event shortly after the 202 is returned.
+    """
+    if not settings.jira_webhook_secret:
+        raise HTTPException(status_code=503, detail="Webhooks are disabled (JIRA_WEBHOOK_SECRET is not set)")
+
+    body = await request.body()
+    if not hmac.compare_digest(
+        x_hub_signature or "", webhook_signature(settings.jira_webhook_secret, body)
+    ):
+        raise HTTPException(status_code=401, detail="Invalid webhook signature")
+
+    try:
+        payload = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="Invalid JSON body")
+    if not isinstance(payload, dict):
+        raise HTTPException(status_code=400, detail="Invalid webhook payload")
+
+    event = payload.get("webhookEvent")
+    issue = payload.get("issue")
+    if event not in ISSUE_EVENTS:
+        return {"accepted": False, "event": event}
+    if not isinstance(issue, dict) or not _is_nonempty_str(issue.get("id")) or not _is_nonempty_str(issue.get("key")):
+        raise HTTPException(status_code=400, detail="Webhook issue needs string id and key")
+    fields = issue.get("fields") or {}
+    if not isinstance(fields, dict):
+        raise HTTPException(status_code=400, detail="Webhook issue fields must be an object")
+
+    if event == "jira:issue_deleted":
+        issue_mirror.queue_delete(connection_id, issue["id"])
+    else:
+        try:
+            mapped = jira_service.map_issue_fields(issue, MIRROR_FIELDS)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise HTTPException(status_code=400, detail=f"Malformed webhook issue: {type(e).__name__}: {e}")
+        issue_mirror.queue_upsert(connection_id, mapped)
+
+    project = fields.get("project")
+    project_key = project.get("key") if isinstance(project, dict) else None
+    jira_service.invalidate_project(connection_id, project_key if isinstance(project_key, str) else None)
+
+    return {"accepted": True, "event": event, "issue_key": issue.get("key")}
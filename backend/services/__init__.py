@@ -1,5 +1,10 @@
 """Services package initialization"""
 from services.nango_service import nango_service
 from services.jira_service import jira_service
+from services.issue_mirror import issue_mirror
+from services.connection_status import connection_status
+from services.job_queue import job_queue
+from services.live_feed import live_feed
+from services.admission import admission
 
-__all__ = ["nango_service", "jira_service"]
+__all__ = ["nango_service", "jira_service", "issue_mirror", "connection_status", "job_queue", "live_feed", "admission"]
@@ -0,0 +1,273 @@
+"""
+Admission control for API requests: concurrency limits, a bounded wait queue and request deadlines
+"""
+import asyncio
+import contextvars
+import math
+import time
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple, Union
+from config import get_settings
+from services.metrics import ADMISSION_SHED, ADMISSION_WAIT, registry
+
+settings = get_settings()
+
+# Reasons a request is shed, as labelled in admission_shed_total
+SHED_REASONS = ("queue_full", "connection_queue_full", "queue_timeout")
+
+
+
+class SharedDeadline:
+    """
+    Deadline of upstream work shared by several requests
+
+    It is the latest deadline among the requests that joined, or None once
+    any of them has none. Joined deadlines may themselves be shared, so a
+    shared call made from inside another one follows its extensions.
+    """
+
+    __slots__ = ("_joined",)
+
+    def __init__(self):
+        self._joined: Optional[List[Union[float, "SharedDeadline"]]] = []
+
+    def join(self, deadline: Optional[Union[float, "SharedDeadline"]]) -> None:
+        """Extend the deadline to cover a request with the given deadline"""
+        if deadline is None:
+            self._joined = None
+        elif self._joined is not None:
+            self._joined.append(deadline)
+
+    @property
+    def at(self) -> Optional[float]:
+        """Monotonic time of the deadline, or None when unbounded"""
+        if self._joined is None:
+            return None
+        latest = None
+        for deadline in self._joined:
+            if isinstance(deadline, SharedDeadline):
+                deadline = deadline.at
+                if deadline is None:
+                    return None
+            latest = deadline if latest is None else max(latest, deadline)
+        return latest
+
+
+# Monotonic time by which the current request's upstream work must be done
+request_deadline: contextvars.ContextVar[Optional[Union[float, SharedDeadline]]] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+class OverloadedError(Exception):
+    """Raised when a request is shed instead of admitted"""
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(f"Server is overloaded ({reason.replace('_', ' ')}), retry later")
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class DeadlineExceededError(Exception):
+    """Raised when the request deadline passes before upstream work is done"""
+
+    def __init__(self):
+        super().__init__("Request deadline exceeded while waiting on Jira")
+
+
+def time_remaining() -> Optional[float]:
+    """Seconds left before the current request's deadline, or None without one"""
+    deadline = request_deadline.get()
+    if isinstance(deadline, SharedDeadline):
+        deadline = deadline.at
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def detached_context() -> contextvars.Context:
+    """
+    Copy of the current context without the request deadline
+
+    For tasks started by a request that outlive it (background syncs and
+    revalidations, feed pollers), which must not be cut short by its deadline.
+    """
+    context = contextvars.copy_context()
+    context.run(request_deadline.set, None)
+    return context
+
+
+class AdmissionController:
+    """
+    Limits concurrent API requests globally and per connection
+
+    A request that finds every slot taken (ADMISSION_MAX_CONCURRENCY overall,
+    ADMISSION_CONNECTION_MAX_CONCURRENCY for its connection) waits in a FIFO
+    queue for at most ADMISSION_QUEUE_TIMEOUT. When the queue is full (overall
+    or for the connection) it is rejected immediately, so a spike is answered
+    with fast 503s carrying Retry-After instead of piling up coroutines that
+    all wait on Nango. A freed slot goes to the oldest waiter whose connection
+    is under its limit, so one busy tenant cannot block the others.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        connection_max_concurrency: int,
+        max_queue: int,
+        connection_max_queue: int,
+        queue_timeout: float
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.connection_max_concurrency = max(1, connection_max_concurrency)
+        self.max_queue = max_queue
+        self.connection_max_queue = connection_max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._active_by_connection: Dict[str, int] = {}
+        self._queued_by_connection: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[Optional[str], asyncio.Future]] = deque()
+        # Moving average of how long a request holds its slot (for Retry-After)
+        self._hold_time = 0.1
+
+    def _has_capacity(self, connection_id: Optional[str]) -> bool:
+        if self.active >= self.max_concurrency:
+            return False
+        if connection_id is None:
+            return True
+        return self._active_by_connection.get(connection_id, 0) < self.connection_max_concurrency
+
+    def _grant(self, connection_id: Optional[str]) -> None:
+        self.active += 1
+        if connection_id is not None:
+            self._active_by_connection[connection_id] = self._active_by_connection.get(connection_id, 0) + 1
+
+    def _dequeue(self, entry: Tuple[Optional[str], asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(entry)
+        except ValueError:
+            return
+        connection_id = entry[0]
+        if connection_id is not None:
+            queued = self._queued_by_connection[connection_id] - 1
+            if queued:
+                self._queued_by_connection[connection_id] = queued
+            else:
+                del self._queued_by_connection[connection_id]
+
+    def _retry_after(self, queued: int, concurrency: int) -> float:
+        """Rough time until the queue ahead has drained"""
+        return max(1.0, math.ceil(self._hold_time * (queued + 1) / concurrency))
+
+    def _shed(self, reason: str, connection_id: Optional[str]) -> OverloadedError:
+        ADMISSION_SHED.inc(reason)
+        if reason == "connection_queue_full" and connection_id is not None:
+            retry_after = self._retry_after(
+                self._queued_by_connection.get(connection_id, 0), self.connection_max_concurrency
+            )
+        else:
+            retry_after = self._retry_after(len(self._waiters), self.max_concurrency)
+        return OverloadedError(reason, retry_after)
+
+    async def acquire(self, connection_id: Optional[str], timeout: Optional[float] = None) -> None:
+        """
+        Wait for a slot
+
+        Args:
+            connection_id: Connection the request is for (None: global limit only)
+            timeout: Longest time to queue; defaults to ADMISSION_QUEUE_TIMEOUT
+
+        Raises:
+            OverloadedError: The queue is full or no slot freed up in time
+        """
+        # Waiters are only ever blocked by a full limit, so a free slot can be
+        # taken without overtaking anyone who could use it
+        if self._has_capacity(connection_id):
+            self._grant(connection_id)
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue_full", connection_id)
+        if connection_id is not None and self._queued_by_connection.get(connection_id, 0) >= self.connection_max_queue:
+            raise self._shed("connection_queue_full", connection_id)
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (connection_id, future)
+        self._waiters.append(entry)
+        if connection_id is not None:
+            self._queued_by_connection[connection_id] = self._queued_by_connection.get(connection_id, 0) + 1
+
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout if timeout is None else max(0.0, timeout))
+        except BaseException as e:
+            if future.done() and not future.cancelled():
+                # Granted just as the wait was given up: hand the slot on
+                self.release(connection_id)
+            else:
+                self._dequeue(entry)
+            if isinstance(e, asyncio.TimeoutError):
+                raise self._shed("queue_timeout", connection_id) from None
+            raise
+        finally:
+            ADMISSION_WAIT.observe(time.monotonic() - started)
+
+    def release(self, connection_id: Optional[str]) -> None:
+        """Free a slot and hand it to the oldest waiter that may take it"""
+        self.active -= 1
+        if connection_id is not None:
+            active = self._active_by_connection.get(connection_id, 0) - 1
+            if active > 0:
+                self._active_by_connection[connection_id] = active
+            else:
+                self._active_by_connection.pop(connection_id, None)
+
+        for entry in list(self._waiters):
+            if self.active >= self.max_concurrency:
+                break
+            waiter_connection, future = entry
+            if future.done() or not self._has_capacity(waiter_connection):
+                continue
+            self._dequeue(entry)
+            self._grant(waiter_connection)
+            future.set_result(None)
+
+    def record_hold_time(self, seconds: float) -> None:
+        """Feed how long a request held its slot into the Retry-After estimate"""
+        self._hold_time = 0.9 * self._hold_time + 0.1 * seconds
+
+    def queue_depth(self) -> int:
+        """Requests currently waiting for a slot"""
+        return len(self._waiters)
+
+    def stats(self) -> Dict[str, Any]:
+        """Limits, current load and shed counts (for /health)"""
+        return {
+            "in_flight": self.active,
+            "max_concurrency": self.max_concurrency,
+            "queued": len(self._waiters),
+            "max_queue": self.max_queue,
+            "queued_by_connection": dict(self._queued_by_connection),
+            "shed": {reason: int(ADMISSION_SHED.value(reason)) for reason in SHED_REASONS}
+        }
+
+
+# Singleton instance
+admission = AdmissionController(
+    max_concurrency=settings.admission_max_concurrency,
+    connection_max_concurrency=settings.admission_connection_max_concurrency,
+    max_queue=settings.admission_max_queue,
+    connection_max_queue=settings.admission_connection_max_queue,
+    queue_timeout=settings.admission_queue_timeout
+)
+
+registry.gauge(
+    "admission_in_flight",
+    "API requests holding an admission slot",
+    callback=lambda: {(): admission.active}
+)
+registry.gauge(
+    "admission_queue_depth",
+    "API requests waiting for an admission slot",
+    callback=lambda: {(): admission.queue_depth()}
+)
@@ -0,0 +1,167 @@
+"""
+In-process caches for upstream lookups
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Set, Tuple
+from services.metrics import CACHE_REQUESTS
+from services.singleflight import SingleFlight
+
+
+class TTLCache:
+    """
+    Size-bounded LRU cache whose entries expire after a fixed TTL
+
+    Concurrent misses for the same key share a single in-flight load, so a
+    burst of requests for a cold key results in one upstream call.
+
+    Besides the entry count (max_size), the cache can be bounded by total
+    weight: with a weigher (e.g. encoded size in bytes) and max_weight, least
+    recently used entries are evicted until the total fits. Entries can carry
+    tags, and invalidate_tag drops every entry (and in-flight load) with a tag.
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_size: int,
+        name: str = "default",
+        max_weight: Optional[float] = None,
+        weigher: Optional[Callable[[Any], float]] = None
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.max_size = max_size
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0.0
+        # key -> (expires_at, value, weight, tags)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any, float, Tuple[Hashable, ...]]]" = OrderedDict()
+        self._tags: Dict[Hashable, Set[Hashable]] = {}
+        self._inflight = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return a fresh cached value or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_REQUESTS.inc(self.name, "miss")
+            return None
+        expires_at, value = entry[0], entry[1]
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            CACHE_REQUESTS.inc(self.name, "miss")
+            return None
+        self._entries.move_to_end(key)
+        CACHE_REQUESTS.inc(self.name, "hit")
+        return value
+
+    def set(self, key: Hashable, value: Any, tags: Iterable[Hashable] = ()) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        tags = tuple(tags)
+        weight = self.weigher(value) if self.weigher else 0.0
+        if self.max_weight is not None and weight > self.max_weight:
+            # Would evict everything else and still not fit
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._entries[key] = (time.monotonic() + self.ttl, value, weight, tags)
+        self.weight += weight
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_size or (
+            self.max_weight is not None and self.weight > self.max_weight
+        ):
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.weight -= entry[2]
+        for tag in entry[3]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def invalidate(self, key: Hashable) -> None:
+        """Drop a cached value; loads already in flight are not cached"""
+        self._remove(key)
+        self._inflight.forget(key)
+
+    def invalidate_tag(self, tag: Hashable) -> int:
+        """Drop every value (and in-flight load) tagged with tag; returns the count"""
+        keys = self._tags.pop(tag, set())
+        for key in keys:
+            self.invalidate(key)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached value"""
+        self._entries.clear()
+        self._tags.clear()
+        self.weight = 0.0
+        self._inflight = SingleFlight()
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Iterable[Hashable] = ()
+    ) -> Any:
+        """
+        Return the cached value for key, loading it on a miss
+
+        Args:
+            key: Cache key
+            loader: Coroutine factory producing the value; None results are
+                returned but not cached
+            tags: Tags for the cached value (see invalidate_tag); a load
+                in flight when one of its tags is invalidated is not cached
+
+        Returns:
+            The cached or freshly loaded value
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        tags = tuple(tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        return await self._inflight.do(key, lambda: self._load(key, loader, tags))
+
+    async def _load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        tags: Tuple[Hashable, ...] = ()
+    ) -> Any:
+        """Run a load and cache its result unless the key was invalidated meanwhile"""
+        try:
+            value = await loader()
+        except BaseException:
+            self._untag_unless_cached(key, tags)
+            raise
+        if value is not None and self._inflight.is_current(key, asyncio.current_task()):
+            self.set(key, value, tags)
+        else:
+            self._untag_unless_cached(key, tags)
+        return value
+
+    def _untag_unless_cached(self, key: Hashable, tags: Tuple[Hashable, ...]) -> None:
+        if key in self._entries:
+            return
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
@@ -0,0 +1,180 @@
+"""
+Stale-while-revalidate connection status backed by the `connections` collection
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from pymongo import ASCENDING
+from pymongo.errors import OperationFailure
+from config import get_settings
+from services.admission import detached_context
+from services.nango_service import nango_service
+from services.jira_service import jira_service
+from services.singleflight import SingleFlight
+from services.metrics import MONGO_LATENCY
+
+settings = get_settings()
+
+
+class ConnectionStatusService:
+    """
+    Answers connection status from the stored `connections` document
+
+    A document verified within CONNECTION_STATUS_FRESH_SECONDS is returned as
+    is. An older one (up to CONNECTION_STATUS_STALE_SECONDS) is still returned
+    immediately while a background revalidation against Nango/Jira refreshes
+    it. Anything older, or missing, is revalidated before answering.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._revalidations = SingleFlight()
+        self._background: set = set()
+
+    async def startup(self, db) -> None:
+        """Bind the database and create the connections indexes"""
+        self.db = db
+        await self.ensure_indexes()
+
+    async def shutdown(self) -> None:
+        """Cancel background revalidations still running"""
+        for task in list(self._background):
+            task.cancel()
+        await asyncio.gather(*self._background, return_exceptions=True)
+
+    async def ensure_indexes(self) -> None:
+        """Unique index for connection_id lookups, TTL index expiring stale entries"""
+        try:
+            await self.db.connections.create_index(
+                [("connection_id", ASCENDING)], unique=True, name="connection_id_unique"
+            )
+        except OperationFailure as e:
+            # Existing duplicates must be cleaned up before the index can be built
+            print(f"Could not create unique connection_id index: {e}")
+        await self.db.connections.create_index(
+            [("verified_at", ASCENDING)],
+            expireAfterSeconds=settings.connection_ttl_seconds,
+            name="verified_at_ttl"
+        )
+
+    @staticmethod
+    def _status_from_document(doc: Dict[str, Any]) -> Dict[str, Any]:
+        status = {
+            "connected": doc.get("connected", True),
+            "connection_id": doc["connection_id"],
+            "cloud_id": doc.get("cloud_id"),
+            "account_id": doc.get("account_id"),
+            "user_email": doc.get("user_email"),
+            "user_name": doc.get("user_name")
+        }
+        if not status["connected"]:
+            status["error"] = doc.get("error", "Connection not found in Nango")
+        return status
+
+    async def get_status(self, connection_id: str) -> Dict[str, Any]:
+        """
+        Get the status of a connection, revalidating in the background when stale
+
+        Args:
+            connection_id: The Nango connection identifier
+
+        Returns:
+            Status payload for GET /api/connection/{connection_id}
+        """
+        with MONGO_LATENCY.time("connections.find_one"):
+            doc = await self.db.connections.find_one({"connection_id": connection_id})
+
+        verified_at = doc.get("verified_at") if doc else None
+        if verified_at:
+            age = datetime.utcnow() - verified_at
+            if age <= timedelta(seconds=settings.connection_status_fresh_seconds):
+                return self._status_from_document(doc)
+            if age <= timedelta(seconds=settings.connection_status_stale_seconds):
+                self._revalidate_in_background(connection_id)
+                return self._status_from_document(doc)
+
+        return await self._revalidations.do(
+            connection_id, lambda: self.revalidate(connection_id, doc or {})
+        )
+
+    def _revalidate_in_background(self, connection_id: str) -> None:
+        if connection_id in self._revalidations:
+            return
+
+        async def run() -> None:
+            try:
+                await self._revalidations.do(connection_id, lambda: self.revalidate(connection_id))
+            except Exception as e:
+                print(f"Background revalidation of {connection_id} failed: {e}")
+
+        task = detached_context().run(asyncio.create_task, run())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def revalidate(
+        self,
+        connection_id: str,
+        stored: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Check a connection against Nango, refresh the user profile from Jira
+        and update the stored document (if the connection was registered)
+
+        Returns:
+            Status payload for GET /api/connection/{connection_id}
+        """
+        connection = await nango_service.get_connection(connection_id)
+        now = datetime.utcnow()
+
+        if not connection:
+            with MONGO_LATENCY.time("connections.update_one"):
+                await self.db.connections.update_one(
+                    {"connection_id": connection_id},
+                    {"$set": {"connected": False, "error": "Connection not found in Nango", "verified_at": now}}
+                )
+            return {
+                "connected": False,
+                "connection_id": connection_id,
+                "error": "Connection not found in Nango"
+            }
+
+        config = connection.get("connection_config", {})
+        if config:
+            nango_service.cache_connection_config(connection_id, config)
+        cloud_id = config.get("cloudId")
+
+        if stored is None:
+            with MONGO_LATENCY.time("connections.find_one"):
+                stored = await self.db.connections.find_one({"connection_id": connection_id})
+        user_email = stored.get("user_email") if stored else None
+        user_name = stored.get("user_name") if stored else None
+
+        if cloud_id:
+            user = await jira_service.get_myself(connection_id, cloud_id)
+            if user:
+                user_email = user["email_address"]
+                user_name = user["display_name"]
+
+        status = {
+            "connected": True,
+            "connection_id": connection_id,
+            "cloud_id": cloud_id,
+            "account_id": config.get("accountId"),
+            "user_email": user_email,
+            "user_name": user_name
+        }
+
+        # Only registered connections (POST /api/connection) are persisted
+        with MONGO_LATENCY.time("connections.update_one"):
+            await self.db.connections.update_one(
+                {"connection_id": connection_id},
+                {
+                    "$set": {**status, "verified_at": now, "updated_at": now},
+                    "$unset": {"error": ""}
+                }
+            )
+        return status
+
+
+# Singleton instance
+connection_status = ConnectionStatusService()
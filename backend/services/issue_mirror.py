@@ -0,0 +1,504 @@
+"""
+Local MongoDB mirror of Jira issues, kept current by incremental sync
+"""
+import asyncio
+import math
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from pymongo import ASCENDING, DESCENDING, TEXT, ReplaceOne, UpdateOne
+from config import get_settings
+from services.admission import detached_context
+from services.nango_service import nango_service
+from services.jira_service import jira_service, gather_limited, parse_jira_datetime
+from services.metrics import MONGO_LATENCY
+from services.records import IssueRecord, Record
+
+settings = get_settings()
+
+# Internal fields stored alongside the mapped issue but never returned
+# (description is only returned when asked for through a sparse fieldset)
+_INTERNAL_FIELDS = {
+    "_id": 0, "connection_id": 0, "created_ts": 0, "updated_ts": 0, "mirrored_at": 0,
+    "description": 0, "terms": 0,
+}
+
+# Output fields fetched for mirrored issues: the issue shape without comments
+# (searches never fetch them) plus the plain-text description for local search
+MIRROR_FIELDS = tuple(name for name in IssueRecord.__slots__ if name != "comments") + ("description",)
+
+# Output fields present in mirrored documents (sparse fieldsets outside this set read live)
+MIRRORED_FIELDS = frozenset(MIRROR_FIELDS)
+
+# Bumped when stored documents gain fields; projects synced under an older
+# version get a full resync instead of an incremental one
+MIRROR_SCHEMA_VERSION = 2
+
+# Fields with facet counts in local search results
+FACET_FIELDS = ("status", "assignee", "issue_type", "project_key")
+
+# Stands in for a missing `updated` when ordering writes
+_EPOCH = datetime(1970, 1, 1)
+
+# Mirror reads skip deletion tombstones
+_LIVE = {"deleted": {"$ne": True}}
+
+_WORD = re.compile(r"\w+")
+_MAX_TERMS = 64
+_MAX_FACET_VALUES = 20
+
+
+def search_terms(doc: Dict[str, Any]) -> List[str]:
+    """Lowercased key and summary words, matched by prefix for typeahead"""
+    key = (doc.get("key") or "").lower()
+    words = _WORD.findall(f"{key} {doc.get('summary') or ''}".lower())
+    return [term for term in dict.fromkeys([key, *words]) if term][:_MAX_TERMS]
+
+
+class IssueMirror:
+    """
+    Mirrors Jira issues per connection and project into the `issues` collection
+
+    Each synced project has a document in `issue_sync_state` holding its
+    watermark (the newest `updated` timestamp seen). A sync only asks Jira for
+    issues updated since that watermark and bulk-upserts them. Deletions are
+    not visible to the incremental query and are applied by webhooks.
+
+    Jira does not deliver webhooks in order, so writes are conditional: an
+    upsert only replaces a stored issue whose `updated` is not newer, and a
+    deletion leaves a tombstone (expired after MIRROR_TOMBSTONE_TTL) that
+    later upserts of the same issue cannot overwrite.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._syncs: Dict[str, asyncio.Task] = {}
+        self._loop_task: Optional[asyncio.Task] = None
+        # Buffered webhook writes: document id -> (version, op); the newest
+        # version per issue wins (see _buffer)
+        self._pending: Dict[str, Tuple[Tuple[bool, datetime], Any]] = {}
+        # Created in startup() so they belong to the serving event loop
+        self._pending_event: Optional[asyncio.Event] = None
+        self._batch_full: Optional[asyncio.Event] = None
+        self._flush_task: Optional[asyncio.Task] = None
+
+    async def startup(self, db) -> None:
+        """Bind the database, create indexes and start the background jobs"""
+        self.db = db
+        await self.ensure_indexes()
+        self._pending_event = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        if self._pending:
+            self._pending_event.set()
+        self._flush_task = asyncio.create_task(self._flush_forever())
+        if settings.mirror_sync_interval > 0:
+            self._loop_task = asyncio.create_task(self._run_forever())
+
+    async def shutdown(self) -> None:
+        """Stop the background jobs, flushing buffered webhook writes first"""
+        tasks = list(self._syncs.values())
+        for attr in ("_loop_task", "_flush_task"):
+            task = getattr(self, attr)
+            if task is not None:
+                tasks.append(task)
+                setattr(self, attr, None)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Issue mirror flush on shutdown failed, {len(self._pending)} ops lost: {e}")
+
+    async def ensure_indexes(self) -> None:
+        """Create the indexes used by mirror reads and the sync job"""
+        await self.db.issues.create_index(
+            [("connection_id", ASCENDING), ("project_key", ASCENDING), ("created_ts", DESCENDING)]
+        )
+        # Filtered and faceted local search
+        for field in ("status", "assignee", "issue_type"):
+            await self.db.issues.create_index(
+                [("connection_id", ASCENDING), ("project_key", ASCENDING), (field, ASCENDING), ("created_ts", DESCENDING)]
+            )
+        await self.db.issues.create_index([("connection_id", ASCENDING), ("terms", ASCENDING)])
+        await self.db.issues.create_index(
+            [("connection_id", ASCENDING), ("summary", TEXT), ("description", TEXT)],
+            weights={"summary": 5, "description": 1},
+            name="issue_text"
+        )
+        await self.db.issues.create_index(
+            [("deleted_at", ASCENDING)],
+            expireAfterSeconds=settings.mirror_tombstone_ttl,
+            name="tombstone_ttl"
+        )
+        await self.db.issue_sync_state.create_index([("connection_id", ASCENDING)])
+
+    @staticmethod
+    def _state_id(connection_id: str, project_key: str) -> str:
+        return f"{connection_id}:{project_key}"
+
+    @staticmethod
+    def _normalize_project_key(project_key: str) -> str:
+        # JQL matches project keys case-insensitively, but documents store
+        # Jira's upper-case key
+        return project_key.upper()
+
+    async def is_mirrored(self, connection_id: str, project_key: str) -> bool:
+        """Whether a project has completed at least one sync"""
+        project_key = self._normalize_project_key(project_key)
+        state = await self.db.issue_sync_state.find_one(
+            {"_id": self._state_id(connection_id, project_key), "watermark": {"$ne": None}},
+            {"_id": 1}
+        )
+        return state is not None
+
+    async def find_issues(
+        self,
+        connection_id: str,
+        project_key: str,
+        max_results: int = 50,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[dict]:
+        """
+        Read mirrored issues for a project, newest first
+
+        Args:
+            connection_id: Nango connection ID
+            project_key: Project key
+            max_results: Maximum number of results
+            fields: Optional sparse fieldset, applied as a projection
+
+        Returns:
+            Issues in the same shape as JiraService.get_issues
+        """
+        project_key = self._normalize_project_key(project_key)
+        projection = _INTERNAL_FIELDS
+        if fields is not None:
+            projection = {"_id": 0, **{name: 1 for name in fields}}
+        cursor = self.db.issues.find(
+            {"connection_id": connection_id, "project_key": project_key, **_LIVE},
+            projection
+        ).sort("created_ts", DESCENDING).limit(max_results)
+        return await cursor.to_list(length=max_results)
+
+    async def search(
+        self,
+        connection_id: str,
+        q: Optional[str] = None,
+        match: str = "text",
+        filters: Optional[Dict[str, Sequence[str]]] = None,
+        max_results: int = 20,
+        fields: Optional[Sequence[str]] = None,
+        facets: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Search mirrored issues without a Jira round trip
+
+        Args:
+            connection_id: Nango connection ID
+            q: Search text; matched against summary and description with
+                match="text", or as word prefixes of key and summary with
+                match="prefix" (typeahead)
+            match: "text" or "prefix"
+            filters: Exact-match filters by FACET_FIELDS name, e.g.
+                {"status": ["To Do", "In Progress"]}
+            max_results: Maximum number of issues returned
+            fields: Optional sparse fieldset, applied as a projection
+            facets: Also count matches per status, assignee, issue type and project
+
+        Returns:
+            {"issues": [...], "total": n, "facets": {field: [{"value", "count"}]}}
+            (total and facets only with facets=True); text matches are
+            ordered by relevance and carry a "score", others newest first
+        """
+        query: Dict[str, Any] = {"connection_id": connection_id, **_LIVE}
+        for field, values in (filters or {}).items():
+            if values:
+                if field == "project_key":
+                    values = [self._normalize_project_key(value) for value in values]
+                query[field] = values[0] if len(values) == 1 else {"$in": list(values)}
+
+        text = bool(q) and match == "text"
+        if text:
+            query["$text"] = {"$search": q}
+        elif q:
+            prefixes = [re.compile("^" + re.escape(word)) for word in _WORD.findall(q.lower())]
+            if prefixes:
+                query["terms"] = {"$all": prefixes}
+
+        projection: Dict[str, Any] = dict(_INTERNAL_FIELDS)
+        if fields is not None:
+            projection = {"_id": 0, **{name: 1 for name in fields}}
+        sort: List[Any] = [("created_ts", DESCENDING)]
+        if text:
+            projection["score"] = {"$meta": "textScore"}
+            sort.insert(0, ("score", {"$meta": "textScore"}))
+
+        async def find() -> List[dict]:
+            with MONGO_LATENCY.time("issues.search"):
+                cursor = self.db.issues.find(query, projection).sort(sort).limit(max_results)
+                return await cursor.to_list(length=max_results)
+
+        if not facets:
+            return {"issues": await find()}
+
+        async def count_facets() -> Dict[str, Any]:
+            pipeline = [
+                {"$match": query},
+                {"$facet": {
+                    "total": [{"$count": "count"}],
+                    **{
+                        field: [{"$sortByCount": f"${field}"}, {"$limit": _MAX_FACET_VALUES}]
+                        for field in FACET_FIELDS
+                    }
+                }}
+            ]
+            with MONGO_LATENCY.time("issues.facets"):
+                rows = await self.db.issues.aggregate(pipeline).to_list(length=1)
+            return rows[0] if rows else {}
+
+        issues, counts = await asyncio.gather(find(), count_facets())
+        total = counts.get("total") or [{"count": 0}]
+        return {
+            "issues": issues,
+            "total": total[0]["count"],
+            "facets": {
+                field: [{"value": row["_id"], "count": row["count"]} for row in counts.get(field, [])]
+                for field in FACET_FIELDS
+            }
+        }
+
+    @staticmethod
+    def to_document(connection_id: str, issue: Union[IssueRecord, Dict[str, Any]]) -> dict:
+        """Build the stored document for a mapped issue (record or MIRROR_FIELDS dict)"""
+        doc = issue.to_dict() if isinstance(issue, Record) else dict(issue)
+        # Kept so full mirror reads have the same shape as live ones
+        doc.setdefault("comments", [])
+        doc["connection_id"] = connection_id
+        doc["created_ts"] = parse_jira_datetime(doc.get("created_at"))
+        doc["updated_ts"] = parse_jira_datetime(doc.get("updated_at"))
+        doc["terms"] = search_terms(doc)
+        doc["mirrored_at"] = datetime.utcnow()
+        return doc
+
+    @staticmethod
+    def document_id(connection_id: str, issue_id: str) -> str:
+        return f"{connection_id}:{issue_id}"
+
+    def upsert_op(self, connection_id: str, issue: Union[IssueRecord, Dict[str, Any]]) -> UpdateOne:
+        """
+        Build a bulk upsert for one mapped issue
+
+        The stored document is only replaced if it is not newer (by
+        `updated`) and not a deletion tombstone, so out-of-order events
+        cannot roll an issue back or bring a deleted one back.
+        """
+        doc = self.to_document(connection_id, issue)
+        doc["_id"] = self.document_id(connection_id, doc["id"])
+        return self._replace_unless_newer(doc)
+
+    @staticmethod
+    def _replace_unless_newer(doc: Dict[str, Any]) -> UpdateOne:
+        return UpdateOne(
+            {"_id": doc["_id"]},
+            [{"$replaceWith": {"$cond": {
+                "if": {"$or": [
+                    {"$eq": ["$deleted", True]},
+                    {"$gt": [{"$ifNull": ["$updated_ts", _EPOCH]}, doc["updated_ts"] or _EPOCH]}
+                ]},
+                "then": "$$ROOT",
+                # Literal: summaries and descriptions may start with "$"
+                "else": {"$literal": doc}
+            }}}],
+            upsert=True
+        )
+
+    def tombstone_op(self, connection_id: str, issue_id: str) -> ReplaceOne:
+        """Build a bulk write replacing an issue with its deletion tombstone"""
+        doc_id = self.document_id(connection_id, issue_id)
+        return ReplaceOne(
+            {"_id": doc_id},
+            {"connection_id": connection_id, "id": issue_id, "deleted": True, "deleted_at": datetime.utcnow()},
+            upsert=True
+        )
+
+    def queue_upsert(self, connection_id: str, issue: Union[IssueRecord, Dict[str, Any]]) -> None:
+        """Buffer an upsert of a mapped issue (applied by the next flush)"""
+        doc = self.to_document(connection_id, issue)
+        doc["_id"] = self.document_id(connection_id, doc["id"])
+        self._buffer(doc["_id"], (False, doc["updated_ts"] or _EPOCH), self._replace_unless_newer(doc))
+        self._wake_flusher()
+
+    def queue_delete(self, connection_id: str, issue_id: str) -> None:
+        """Buffer removal of an issue from the mirror (as a tombstone)"""
+        self._buffer(
+            self.document_id(connection_id, issue_id),
+            (True, datetime.max),
+            self.tombstone_op(connection_id, issue_id)
+        )
+        self._wake_flusher()
+
+    def _buffer(self, doc_id: str, version: Tuple[bool, datetime], op: Any) -> None:
+        """Keep op unless a newer write (or a deletion) for the issue is already buffered"""
+        current = self._pending.get(doc_id)
+        if current is None or version >= current[0]:
+            self._pending[doc_id] = (version, op)
+
+    def _wake_flusher(self) -> None:
+        if self._pending_event is None:
+            # Not started yet: flushed once startup() starts the flusher
+            return
+        self._pending_event.set()
+        if len(self._pending) >= settings.webhook_batch_max_size:
+            # Cut the coalescing window short once a batch is full
+            self._batch_full.set()
+
+    async def flush(self) -> int:
+        """
+        Write all buffered operations in one bulk_write; returns the op count
+
+        If the write fails, the operations go back into the buffer (behind
+        any newer event for the same issue) and the error is raised; the
+        conditional upserts and tombstones are idempotent, so retrying a
+        partly applied batch is safe.
+        """
+        if not self._pending:
+            return 0
+        pending, self._pending = self._pending, {}
+        try:
+            with MONGO_LATENCY.time("issues.bulk_write"):
+                await self.db.issues.bulk_write([op for _, op in pending.values()], ordered=False)
+        except BaseException:
+            for doc_id, (version, op) in pending.items():
+                self._buffer(doc_id, version, op)
+            raise
+        return len(pending)
+
+    async def _flush_forever(self) -> None:
+        failures = 0
+        while True:
+            await self._pending_event.wait()
+            # Coalescing window: let a burst of events accumulate
+            try:
+                await asyncio.wait_for(self._batch_full.wait(), settings.webhook_batch_window)
+            except asyncio.TimeoutError:
+                pass
+            self._pending_event.clear()
+            self._batch_full.clear()
+            try:
+                await self.flush()
+                failures = 0
+            except Exception as e:
+                failures += 1
+                delay = min(settings.webhook_batch_window * 2 ** failures, 60)
+                print(f"Issue mirror flush failed ({len(self._pending)} ops kept, retrying in {delay:.1f}s): {e}")
+                await asyncio.sleep(delay)
+                self._pending_event.set()
+
+    def sync_project(self, connection_id: str, project_key: str) -> "asyncio.Task":
+        """
+        Start (or join) an incremental sync of one project
+
+        Only one sync per project runs at a time; callers arriving while one
+        is running share its task.
+
+        Returns:
+            Task resolving to sync stats ({"upserted": n, "watermark": ...})
+        """
+        project_key = self._normalize_project_key(project_key)
+        key = self._state_id(connection_id, project_key)
+        task = self._syncs.get(key)
+        if task is None or task.done():
+            # Outlives the request that started it, so not bound by its deadline
+            task = detached_context().run(asyncio.create_task, self._sync_project(connection_id, project_key))
+            self._syncs[key] = task
+            task.add_done_callback(lambda t: self._forget_sync(key, t))
+        return task
+
+    def _forget_sync(self, key: str, task: "asyncio.Task") -> None:
+        if self._syncs.get(key) is task:
+            del self._syncs[key]
+        # Background syncs may have no awaiting caller; log instead of warning
+        if not task.cancelled() and task.exception() is not None:
+            print(f"Issue sync failed for {key}: {task.exception()}")
+
+    async def _sync_project(self, connection_id: str, project_key: str) -> Dict[str, Any]:
+        cloud_id = await nango_service.get_cloud_id(connection_id)
+        if not cloud_id:
+            raise ValueError("Could not get Jira Cloud ID")
+
+        state_id = self._state_id(connection_id, project_key)
+        state = await self.db.issue_sync_state.find_one({"_id": state_id}) or {}
+        watermark: Optional[datetime] = None
+        if state.get("schema_version") == MIRROR_SCHEMA_VERSION:
+            watermark = state.get("watermark")
+        started_at = datetime.utcnow()
+
+        # Relative JQL dates are evaluated server-side, which sidesteps the
+        # Jira user's timezone; the overlap absorbs minute truncation.
+        jql = None
+        if watermark:
+            elapsed = (started_at - watermark).total_seconds() / 60
+            minutes = math.ceil(elapsed) + settings.mirror_sync_overlap_minutes
+            jql = f'updated >= "-{minutes}m"'
+
+        upserted = 0
+        pages = jira_service.iter_issue_pages(
+            connection_id, cloud_id, project_key=project_key, jql=jql, fields=MIRROR_FIELDS
+        )
+        try:
+            async for page in pages:
+                with MONGO_LATENCY.time("issues.bulk_write"):
+                    await self.db.issues.bulk_write(
+                        [self.upsert_op(connection_id, issue) for issue in page],
+                        ordered=False
+                    )
+                upserted += len(page)
+                for issue in page:
+                    updated = parse_jira_datetime(issue["updated_at"])
+                    if updated and (watermark is None or updated > watermark):
+                        watermark = updated
+        finally:
+            await pages.aclose()
+
+        await self.db.issue_sync_state.update_one(
+            {"_id": state_id},
+            {
+                "$set": {
+                    "connection_id": connection_id,
+                    "project_key": project_key,
+                    # An empty project still counts as synced from this point on
+                    "watermark": watermark or started_at,
+                    "last_synced_at": started_at,
+                    "schema_version": MIRROR_SCHEMA_VERSION
+                }
+            },
+            upsert=True
+        )
+        return {"project_key": project_key, "upserted": upserted, "watermark": watermark or started_at}
+
+    async def sync_all(self) -> None:
+        """Run one incremental sync pass over every mirrored project"""
+        states = await self.db.issue_sync_state.find(
+            {}, {"connection_id": 1, "project_key": 1}
+        ).to_list(length=None)
+
+        async def sync(state: dict) -> None:
+            try:
+                await self.sync_project(state["connection_id"], state["project_key"])
+            except Exception:
+                pass  # already logged by _forget_sync
+
+        await gather_limited((sync(state) for state in states), settings.jira_max_concurrency)
+
+    async def _run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(settings.mirror_sync_interval)
+            try:
+                await self.sync_all()
+            except Exception as e:
+                print(f"Issue sync pass failed: {e}")
+
+
+# Singleton instance
+issue_mirror = IssueMirror()
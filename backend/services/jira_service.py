@@ -1,14 +1,238 @@
 """
 Jira API service for project and issue operations
 """
+import asyncio
+import heapq
+import re
 import httpx
-from typing import List, Optional, Dict, Any
-from services.nango_service import nango_service
+from datetime import datetime, timezone
+from itertools import islice
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Iterator, List, Optional, Dict, Any, Sequence, Tuple, Union
+from config import get_settings
+from services.admission import DeadlineExceededError
+from services.nango_service import may_have_been_sent, nango_service
+from services.rate_limiter import UpstreamBusyError
+from services.cache import TTLCache
+from services.records import Comment, CommentAuthor, IssueRecord, ProjectRecord, RecordList
+
+settings = get_settings()
+
+# Upstream statuses that mean "try again later" rather than "nothing there"
+THROTTLED_STATUSES = {429, 503}
+
+# Issue fields requested from /search/jql
+ISSUE_FIELDS = "summary,status,assignee,issuetype,project,created,updated"
+
+# Sparse fieldsets: output field -> (Jira field id it needs, extractor(issue, fields)).
+# id and key come with every search result and are always returned.
+SPARSE_ISSUE_FIELDS: Dict[str, Tuple[Optional[str], Callable[[dict, dict], Any]]] = {
+    "id": (None, lambda issue, fields: issue["id"]),
+    "key": (None, lambda issue, fields: issue["key"]),
+    "summary": ("summary", lambda issue, fields: fields.get("summary", "")),
+    "issue_type": ("issuetype", lambda issue, fields: (fields.get("issuetype") or {}).get("name", "Task")),
+    "status": ("status", lambda issue, fields: (fields.get("status") or {}).get("name", "Unknown")),
+    "assignee": ("assignee", lambda issue, fields: (fields.get("assignee") or {}).get("displayName")),
+    "url": (None, lambda issue, fields: issue.get("self", "")),
+    "web_url": (None, lambda issue, fields: f"https://atlassian.net/browse/{issue['key']}"),
+    "project_id": ("project", lambda issue, fields: (fields.get("project") or {}).get("id", "")),
+    "project_key": ("project", lambda issue, fields: (fields.get("project") or {}).get("key", "")),
+    "project_name": ("project", lambda issue, fields: (fields.get("project") or {}).get("name", "")),
+    "created_at": ("created", lambda issue, fields: fields.get("created", "")),
+    "updated_at": ("updated", lambda issue, fields: fields.get("updated", "")),
+    "comments": ("comment", lambda issue, fields: [
+        JiraService.map_comment(c) for c in (fields.get("comment") or {}).get("comments", [])
+    ]),
+    "labels": ("labels", lambda issue, fields: fields.get("labels") or []),
+    "description": ("description", lambda issue, fields: adf_to_text(fields.get("description"))),
+}
+
+# Atlassian Document Format nodes that end a line of plain text
+_ADF_BLOCK_NODES = {
+    "paragraph", "heading", "blockquote", "codeBlock", "listItem", "rule",
+    "panel", "tableRow", "mediaSingle", "decisionItem", "taskItem",
+}
+
+_ORDER_BY = re.compile(r"\border\s+by\b", re.IGNORECASE)
+
+# Issue keys (PROJ-123) or numeric ids; anything else could alter the URL path
+_ISSUE_KEY = re.compile(r"[A-Za-z][A-Za-z0-9_]*-\d+|\d+")
+
+# Most issues whose comments one request may load
+MAX_COMMENT_ISSUE_KEYS = 100
+
+
+class InvalidJQLError(ValueError):
+    """JQL that cannot be safely combined with the project filter"""
+
+
+class InvalidIssueRequestError(ValueError):
+    """An issue creation request that cannot be sent to Jira"""
+
+
+def is_issue_key(value: Any) -> bool:
+    """Whether value is an issue key (PROJ-123) or numeric issue id"""
+    return isinstance(value, str) and _ISSUE_KEY.fullmatch(value) is not None
+
+
+def adf_to_text(node: Any) -> str:
+    """
+    Flatten an Atlassian Document Format value (e.g. an issue description)
+    into plain text; plain strings (API v2) are returned as is
+    """
+    if node is None:
+        return ""
+    if isinstance(node, str):
+        return node
+    if isinstance(node, list):
+        return "".join(adf_to_text(child) for child in node)
+    if not isinstance(node, dict):
+        return ""
+
+    node_type = node.get("type")
+    if node_type == "text":
+        return node.get("text", "")
+    if node_type == "hardBreak":
+        return "\n"
+    attrs = node.get("attrs") or {}
+    if node_type == "mention":
+        return attrs.get("text", "")
+    if node_type == "emoji":
+        return attrs.get("text") or attrs.get("shortName", "")
+    if node_type in ("inlineCard", "blockCard"):
+        return attrs.get("url", "")
+
+    text = adf_to_text(node.get("content"))
+    if node_type in _ADF_BLOCK_NODES:
+        return text.rstrip("\n") + "\n"
+    if node_type == "doc":
+        return text.strip()
+    return text
+
+
+def parse_jira_datetime(value: Optional[str]) -> Optional[datetime]:
+    """Parse a Jira timestamp (e.g. 2024-01-02T10:00:00.000+0000) into naive UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _jql_segments(jql: str) -> Iterator[Tuple[str, str]]:
+    """
+    Split JQL into ("text", ...) runs outside string literals and
+    ("string", ...) literal bodies, kept verbatim with their escapes; a
+    literal still open at the end is yielded as ("unterminated", ...)
+
+    Both quote styles are accepted and a backslash escapes the next
+    character, so every caller agrees on where a string ends.
+    """
+    start = 0
+    quote = None
+    escaped = False
+    for index, char in enumerate(jql):
+        if quote:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == quote:
+                yield "string", jql[start:index]
+                quote = None
+                start = index + 1
+        elif char in ("'", '"'):
+            if index > start:
+                yield "text", jql[start:index]
+            quote = char
+            start = index + 1
+    if quote:
+        yield "unterminated", jql[start:]
+    elif start < len(jql):
+        yield "text", jql[start:]
+
+
+def normalize_jql(jql: Optional[str]) -> str:
+    """
+    Cache-key form of a JQL string: outside string literals, whitespace is
+    collapsed and case folded (JQL keywords and field names are
+    case-insensitive); quoted values are kept verbatim
+    """
+    if not jql:
+        return ""
+    parts = []
+    for kind, text in _jql_segments(jql.strip()):
+        if kind != "text":
+            parts.append('"' + text + ('"' if kind == "string" else ""))
+            continue
+        for char in text:
+            if char.isspace():
+                if parts and parts[-1] != " ":
+                    parts.append(" ")
+                continue
+            parts.append(char.lower())
+    return "".join(parts)
+
+
+def quote_jql(value: str) -> str:
+    """Quote a value as a JQL string literal"""
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+async def gather_limited(coros: Iterable[Awaitable[Any]], limit: int) -> List[Any]:
+    """
+    Await coroutines concurrently with at most `limit` running at once
+
+    Results are returned in input order, like asyncio.gather.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(coro: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
 
 
 class JiraService:
     """Service for Jira-specific operations via Nango proxy"""
-    
+
+    def __init__(self):
+        # Issue search results keyed by normalised query, tagged by project so
+        # writes can drop them (results are shared between callers: read-only)
+        self._query_cache = TTLCache(
+            settings.query_cache_ttl,
+            settings.query_cache_max_entries,
+            name="jira_query",
+            max_weight=settings.query_cache_max_bytes,
+            # Encoded once here and reused by every response serving the entry
+            weigher=lambda value: len(value.json())
+        )
+        self._issue_types_cache = TTLCache(
+            settings.issue_types_cache_ttl,
+            settings.query_cache_max_entries,
+            name="issue_types"
+        )
+
+    @staticmethod
+    def _project_tag(connection_id: str, project_key: Optional[str]) -> tuple:
+        # Queries without a project can match issues of any project
+        if not project_key:
+            return ("connection", connection_id)
+        return ("project", connection_id, project_key.upper())
+
+    def invalidate_project(self, connection_id: str, project_key: Optional[str]) -> None:
+        """
+        Drop cached issue queries that may include a project's issues
+
+        Call after any write to the project (create, bulk create, webhook or
+        observed update). Queries not restricted to a project are dropped too.
+        """
+        if project_key:
+            self._query_cache.invalidate_tag(self._project_tag(connection_id, project_key))
+        self._query_cache.invalidate_tag(self._project_tag(connection_id, None))
+
     async def get_myself(self, connection_id: str, cloud_id: str) -> Optional[dict]:
         """
         Get current user information
@@ -32,7 +256,7 @@ class JiraService:
         except Exception:
             return None
     
-    async def get_projects(self, connection_id: str, cloud_id: str) -> List[dict]:
+    async def get_projects(self, connection_id: str, cloud_id: str) -> List[ProjectRecord]:
         """
         Fetch all accessible Jira projects
         
@@ -45,34 +269,220 @@ class JiraService:
         """
         try:
             endpoint = f"/ex/jira/{cloud_id}/rest/api/3/project/search"
-            data = await nango_service.proxy_get(
-                connection_id, 
-                endpoint,
-                params={"maxResults": 50, "expand": "description"}
-            )
-            
+            page_size = settings.jira_projects_page_size
+
+            async def fetch_page(start_at: int) -> dict:
+                return await nango_service.proxy_get(
+                    connection_id,
+                    endpoint,
+                    params={"startAt": start_at, "maxResults": page_size, "expand": "description"}
+                )
+
+            # The first page tells us how many more there are; fetch the rest concurrently
+            first = await fetch_page(0)
+            pages = [first]
+            values = first.get("values", [])
+            total = first.get("total", len(values))
+            if not first.get("isLast", True) and len(values) < total:
+                step = len(values) or page_size
+                pages += await gather_limited(
+                    (fetch_page(start_at) for start_at in range(step, total, step)),
+                    settings.jira_max_concurrency
+                )
+
             projects = []
-            for p in data.get("values", []):
-                projects.append({
-                    "id": p["id"],
-                    "key": p["key"],
-                    "name": p["name"],
-                    "url": p.get("self", ""),
-                    "project_type_key": p.get("projectTypeKey", "software"),
-                    "web_url": f"https://atlassian.net/browse/{p['key']}"
-                })
+            for page in pages:
+                for p in page.get("values", []):
+                    projects.append(ProjectRecord(
+                        p["id"],
+                        p["key"],
+                        p["name"],
+                        p.get("self", ""),
+                        p.get("projectTypeKey", "software"),
+                        f"https://atlassian.net/browse/{p['key']}"
+                    ))
             return projects
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in THROTTLED_STATUSES:
+                raise
+            return []
         except Exception:
             return []
     
+    @staticmethod
+    def parse_fields(value: Optional[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Parse a comma-separated sparse fieldset (e.g. "summary,status")
+
+        Returns:
+            The requested output fields (always led by id and key), or None
+            for the full default record
+
+        Raises:
+            ValueError: If an unknown field is requested
+        """
+        if not value:
+            return None
+        names = [name.strip() for name in value.split(",") if name.strip()]
+        unknown = [name for name in names if name not in SPARSE_ISSUE_FIELDS]
+        if unknown:
+            raise ValueError(
+                f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(SPARSE_ISSUE_FIELDS)}"
+            )
+        return tuple(dict.fromkeys(["id", "key", *names]))
+
+    @staticmethod
+    def _jira_fields(fields: Optional[Sequence[str]]) -> str:
+        """Jira `fields` parameter covering the requested output fields"""
+        if fields is None:
+            return ISSUE_FIELDS
+        sources = {SPARSE_ISSUE_FIELDS[name][0] for name in fields} - {None}
+        # "id" asks Jira for no fields at all; id and key are always returned
+        return ",".join(sorted(sources)) or "id"
+
+    @staticmethod
+    def map_issue_fields(issue: dict, fields: Sequence[str]) -> dict:
+        """Map only the requested output fields of a raw Jira issue"""
+        raw_fields = issue.get("fields") or {}
+        return {name: SPARSE_ISSUE_FIELDS[name][1](issue, raw_fields) for name in fields}
+
+    def _mapper(self, fields: Optional[Sequence[str]]) -> Callable[[dict], Union[IssueRecord, dict]]:
+        if fields is None:
+            return self.map_issue
+        return lambda issue: self.map_issue_fields(issue, fields)
+
+    @staticmethod
+    def validate_jql(jql: Optional[str]) -> None:
+        """
+        Reject JQL that would escape the clause it is embedded in
+
+        Quotes and parentheses must be balanced, and ORDER BY is not allowed
+        since the search endpoints add their own ordering.
+
+        Raises:
+            InvalidJQLError: The JQL cannot be combined with other clauses
+        """
+        if not jql:
+            return
+        depth = 0
+        unquoted = []
+        for kind, text in _jql_segments(jql):
+            if kind == "unterminated":
+                raise InvalidJQLError("Unterminated string in JQL")
+            if kind == "string":
+                unquoted.append(" ")
+                continue
+            for char in text:
+                if char == "(":
+                    depth += 1
+                elif char == ")":
+                    depth -= 1
+                    if depth < 0:
+                        raise InvalidJQLError("Unbalanced parentheses in JQL")
+            unquoted.append(text)
+        if depth:
+            raise InvalidJQLError("Unbalanced parentheses in JQL")
+        if _ORDER_BY.search("".join(unquoted)):
+            raise InvalidJQLError("ORDER BY is not supported in JQL filters")
+
+    @classmethod
+    def _build_jql(cls, project_key: Optional[str] = None, jql: Optional[str] = None) -> str:
+        """Build the bounded JQL query used by the issue search endpoints"""
+        query_parts = []
+        if project_key:
+            query_parts.append(f"project = {quote_jql(project_key)}")
+        if jql:
+            # Parenthesised so an OR in the filter cannot widen the project restriction
+            cls.validate_jql(jql)
+            query_parts.append(f"({jql})")
+
+        # The /search/jql endpoint requires at least one restriction to be 'bounded'
+        if not query_parts:
+            query_parts.append("created is not null")
+
+        return " AND ".join(query_parts) + " ORDER BY created DESC"
+
+    @staticmethod
+    def map_issue(issue: dict) -> IssueRecord:
+        """Map a raw Jira issue onto the API's issue shape"""
+        fields = issue.get("fields", {})
+        project = fields.get("project") or {}
+        assignee = fields.get("assignee")
+        issue_type = fields.get("issuetype") or {}
+        status = fields.get("status") or {}
+
+        # Simplified comments handling (optional)
+        comments = []
+        if "comment" in fields:
+            comment_data = fields.get("comment") or {}
+            comments = [JiraService.map_comment(c) for c in comment_data.get("comments", [])]
+
+        key = issue["key"]
+        return IssueRecord(
+            issue["id"],
+            key,
+            fields.get("summary", ""),
+            issue_type.get("name", "Task"),
+            status.get("name", "Unknown"),
+            assignee.get("displayName") if assignee else None,
+            issue.get("self", ""),
+            f"https://atlassian.net/browse/{key}",
+            project.get("id", ""),
+            project.get("key", ""),
+            project.get("name", ""),
+            fields.get("created", ""),
+            fields.get("updated", ""),
+            comments
+        )
+
+    @staticmethod
+    def map_comment(comment: dict) -> Comment:
+        """Map a raw Jira comment (with its author) onto the API's comment shape"""
+        author = comment.get("author") or {}
+        return Comment(
+            comment.get("id"),
+            comment.get("created"),
+            comment.get("updated"),
+            CommentAuthor(
+                author.get("accountId"),
+                author.get("active", True),
+                author.get("displayName", "Unknown"),
+                author.get("emailAddress")
+            ),
+            comment.get("body", {})
+        )
+
+    async def _search_page(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        jql_query: str,
+        max_results: int,
+        next_page_token: Optional[str] = None,
+        jira_fields: str = ISSUE_FIELDS
+    ) -> dict:
+        """Fetch one raw page of /search/jql results"""
+        endpoint = f"/ex/jira/{cloud_id}/rest/api/3/search/jql"
+        params: Dict[str, Any] = {
+            "jql": jql_query,
+            "maxResults": max_results,
+            "fields": jira_fields
+        }
+        if next_page_token:
+            params["nextPageToken"] = next_page_token
+        return await nango_service.proxy_get(connection_id, endpoint, params=params)
+
     async def get_issues(
         self, 
         connection_id: str, 
         cloud_id: str,
         project_key: Optional[str] = None,
         max_results: int = 50,
-        jql: Optional[str] = None
-    ) -> List[dict]:
+        jql: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Union[IssueRecord, dict]]:
         """
         Fetch Jira issues
         
@@ -82,86 +492,237 @@ class JiraService:
             project_key: Optional project key to filter
             max_results: Maximum number of results
             jql: Optional JQL query
+            fields: Optional sparse fieldset (see parse_fields); only these
+                are requested from Jira and mapped
             
         Returns:
-            List of Jira issues
+            List of Jira issues (dicts with just the requested fields when
+            a fieldset is given)
         """
-        try:
-            endpoint = f"/ex/jira/{cloud_id}/rest/api/3/search/jql"
-            
-            # Build JQL query
-            query_parts = []
-            if project_key:
-                query_parts.append(f"project = '{project_key}'")
-            if jql:
-                query_parts.append(jql)
-            
-            # The /search/jql endpoint requires at least one restriction to be 'bounded'
-            if not query_parts:
-                query_parts.append("created is not null")
-            
-            jql_query = " AND ".join(query_parts) + " ORDER BY created DESC"
-            
-            data = await nango_service.proxy_get(
+        async def load() -> List[Union[IssueRecord, dict]]:
+            data = await self._search_page(
                 connection_id,
-                endpoint,
-                params={
-                    "jql": jql_query,
-                    "maxResults": max_results,
-                    "fields": "summary,status,assignee,issuetype,project,created,updated"
-                }
+                cloud_id,
+                self._build_jql(project_key, jql),
+                max_results,
+                jira_fields=self._jira_fields(fields)
             )
-            
-            issues = []
-            for issue in data.get("issues", []):
-                fields = issue.get("fields", {})
-                project = fields.get("project", {})
-                assignee = fields.get("assignee")
-                issue_type = fields.get("issuetype", {})
-                status = fields.get("status", {})
-                
-                # Simplified comments handling (optional)
-                comments = []
-                if "comment" in fields:
-                    comment_data = fields.get("comment", {})
-                    for c in comment_data.get("comments", []):
-                        author = c.get("author", {})
-                        comments.append({
-                            "id": c.get("id"),
-                            "createdAt": c.get("created"),
-                            "updatedAt": c.get("updated"),
-                            "author": {
-                                "accountId": author.get("accountId"),
-                                "active": author.get("active", True),
-                                "displayName": author.get("displayName", "Unknown"),
-                                "emailAddress": author.get("emailAddress")
-                            },
-                            "body": c.get("body", {})
-                        })
-                
-                issues.append({
-                    "id": issue["id"],
-                    "key": issue["key"],
-                    "summary": fields.get("summary", ""),
-                    "issue_type": issue_type.get("name", "Task"),
-                    "status": status.get("name", "Unknown"),
-                    "assignee": assignee.get("displayName") if assignee else None,
-                    "url": issue.get("self", ""),
-                    "web_url": f"https://atlassian.net/browse/{issue['key']}",
-                    "project_id": project.get("id", ""),
-                    "project_key": project.get("key", ""),
-                    "project_name": project.get("name", ""),
-                    "created_at": fields.get("created", ""),
-                    "updated_at": fields.get("updated", ""),
-                    "comments": comments
-                })
-            
-            return issues
-        except httpx.HTTPStatusError:
+            mapper = self._mapper(fields)
+            return RecordList(mapper(issue) for issue in data.get("issues", []))
+
+        key = (
+            "issues", connection_id, (project_key or "").upper(), normalize_jql(jql),
+            max_results, tuple(fields) if fields is not None else None
+        )
+        try:
+            return await self._query_cache.get_or_load(
+                key, load, tags=(self._project_tag(connection_id, project_key),)
+            )
+        except (httpx.HTTPStatusError, UpstreamBusyError, DeadlineExceededError, InvalidJQLError):
             raise
         except Exception:
             return []
+
+    async def get_issues_for_projects(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        project_keys: Sequence[str],
+        max_results: int = 50,
+        jql: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> List[Union[IssueRecord, dict]]:
+        """
+        Fetch the newest issues across several projects
+
+        Runs one /search/jql per project concurrently (at most
+        JIRA_MAX_CONCURRENCY at once), each already ordered created DESC,
+        and k-way merges the raw results with a heap. Merging stops at
+        max_results, and only the issues returned are mapped.
+
+        Args:
+            connection_id: Nango connection ID
+            cloud_id: Jira Cloud ID
+            project_keys: Project keys to search
+            max_results: Maximum number of results across all projects
+            jql: Optional JQL query applied to every project
+            fields: Optional sparse fieldset (see parse_fields)
+
+        Returns:
+            Issues from all projects, newest first
+        """
+        jira_fields = self._jira_fields(fields)
+        # `created` is needed to merge, even when the caller did not ask for it
+        if "created" not in jira_fields.split(","):
+            jira_fields = "created" if jira_fields == "id" else f"{jira_fields},created"
+
+        async def search(project_key: str) -> List[dict]:
+            data = await self._search_page(
+                connection_id,
+                cloud_id,
+                self._build_jql(project_key, jql),
+                max_results,
+                jira_fields=jira_fields
+            )
+            return data.get("issues", [])
+
+        def created(issue: dict) -> datetime:
+            parsed = parse_jira_datetime((issue.get("fields") or {}).get("created"))
+            return parsed or datetime.min
+
+        keys = list(dict.fromkeys(key.upper() for key in project_keys))
+
+        async def load() -> List[Union[IssueRecord, dict]]:
+            pages = await gather_limited((search(key) for key in keys), settings.jira_max_concurrency)
+            merged = heapq.merge(*pages, key=created, reverse=True)
+            mapper = self._mapper(fields)
+            return RecordList(mapper(issue) for issue in islice(merged, max_results))
+
+        cache_key = (
+            "issues", connection_id, tuple(sorted(keys)), normalize_jql(jql),
+            max_results, tuple(fields) if fields is not None else None
+        )
+        return await self._query_cache.get_or_load(
+            cache_key, load, tags=[self._project_tag(connection_id, key) for key in keys]
+        )
+
+    async def iter_issue_pages(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        project_key: Optional[str] = None,
+        jql: Optional[str] = None,
+        page_size: int = 100,
+        fields: Optional[Sequence[str]] = None
+    ) -> AsyncIterator[List[Union[IssueRecord, dict]]]:
+        """
+        Stream every matching Jira issue, one mapped page at a time
+
+        Follows nextPageToken until the last page. The next page is requested
+        while the current one is mapped and consumed, and at most two raw
+        pages are held at once, so memory stays flat for any project size.
+
+        Args:
+            connection_id: Nango connection ID
+            cloud_id: Jira Cloud ID
+            project_key: Optional project key to filter
+            jql: Optional JQL query
+            page_size: Issues per upstream page (Jira caps this at 100)
+            fields: Optional sparse fieldset (see parse_fields)
+
+        Yields:
+            Lists of mapped issues, in created DESC order
+        """
+        jql_query = self._build_jql(project_key, jql)
+        jira_fields = self._jira_fields(fields)
+        mapper = self._mapper(fields)
+        pending = asyncio.ensure_future(
+            self._search_page(connection_id, cloud_id, jql_query, page_size, jira_fields=jira_fields)
+        )
+        try:
+            while pending is not None:
+                data = await pending
+                pending = None
+
+                token = data.get("nextPageToken")
+                if token and not data.get("isLast", False):
+                    pending = asyncio.ensure_future(
+                        self._search_page(connection_id, cloud_id, jql_query, page_size, token, jira_fields)
+                    )
+
+                issues = data.get("issues", [])
+                del data
+                if issues:
+                    yield [mapper(issue) for issue in issues]
+        finally:
+            if pending is not None and not pending.done():
+                pending.cancel()
     
+    async def get_comments(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        issue_key: str,
+        page_size: int = 100
+    ) -> List[Comment]:
+        """
+        Fetch every comment of one issue, following startAt pages
+
+        Args:
+            connection_id: Nango connection ID
+            cloud_id: Jira Cloud ID
+            issue_key: Issue key or id
+            page_size: Comments per upstream page
+
+        Returns:
+            Mapped comments, oldest first
+
+        Raises:
+            ValueError: issue_key is not an issue key or id
+        """
+        if not is_issue_key(issue_key):
+            raise ValueError(f"Invalid issue key: {issue_key!r}")
+        endpoint = f"/ex/jira/{cloud_id}/rest/api/3/issue/{issue_key}/comment"
+        comments: List[Comment] = []
+        start_at = 0
+        while True:
+            data = await nango_service.proxy_get(
+                connection_id,
+                endpoint,
+                params={"startAt": start_at, "maxResults": page_size}
+            )
+            page = data.get("comments", [])
+            comments.extend(self.map_comment(c) for c in page)
+            start_at += len(page)
+            if not page or start_at >= data.get("total", 0):
+                return comments
+
+    async def iter_comments(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        issue_keys: Sequence[str]
+    ) -> AsyncIterator[dict]:
+        """
+        Load comments for many issues concurrently, yielding each as it completes
+
+        A fixed pool of JIRA_MAX_CONCURRENCY workers fetches issues, and
+        results pass through a bounded queue, so a slow consumer holds the
+        workers back instead of buffering every issue's comments.
+
+        Args:
+            connection_id: Nango connection ID
+            cloud_id: Jira Cloud ID
+            issue_keys: Issue keys to load comments for
+
+        Yields:
+            {"issue_key", "comments"} per issue, or {"issue_key", "error"}
+            when that issue failed, in completion order
+        """
+        keys = list(dict.fromkeys(issue_keys))
+        pending = iter(keys)
+        results: asyncio.Queue = asyncio.Queue(maxsize=settings.jira_max_concurrency)
+
+        async def worker() -> None:
+            for key in pending:
+                try:
+                    comments = await self.get_comments(connection_id, cloud_id, key)
+                    await results.put({"issue_key": key, "comments": comments})
+                except Exception as e:
+                    await results.put({"issue_key": key, "error": str(e)})
+
+        workers = [
+            asyncio.ensure_future(worker())
+            for _ in range(min(settings.jira_max_concurrency, len(keys)))
+        ]
+        try:
+            for _ in keys:
+                yield await results.get()
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
     async def get_issue_types(
         self, 
         connection_id: str, 
@@ -179,7 +740,7 @@ class JiraService:
         Returns:
             List of issue types
         """
-        try:
+        async def load() -> List[dict]:
             endpoint = f"/ex/jira/{cloud_id}/rest/api/3/issuetype/project"
             data = await nango_service.proxy_get(
                 connection_id,
@@ -187,7 +748,7 @@ class JiraService:
                 params={"projectId": project_id}
             )
             
-            issue_types = []
+            issue_types = RecordList()
             for it in data:
                 issue_types.append({
                     "id": it["id"],
@@ -197,9 +758,72 @@ class JiraService:
                     "subtask": it.get("subtask", False)
                 })
             return issue_types
+
+        try:
+            return await self._issue_types_cache.get_or_load((connection_id, project_id), load)
+        except (UpstreamBusyError, DeadlineExceededError):
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code in THROTTLED_STATUSES:
+                raise
+            return []
         except Exception:
             return []
     
+    @staticmethod
+    def _build_issue_data(request: dict) -> Dict[str, Any]:
+        """
+        Build the Jira issue payload (fields + ADF description) for a create request
+
+        Raises:
+            InvalidIssueRequestError: projectKey is missing or not a non-empty string
+        """
+        project_key = request.get("projectKey")
+        if not isinstance(project_key, str) or not project_key:
+            raise InvalidIssueRequestError("projectKey must be a non-empty string")
+        issue_data: Dict[str, Any] = {
+            "fields": {
+                "project": {"key": request["projectKey"]},
+                "summary": request["summary"],
+                "issuetype": {"name": request["issueType"]}
+            }
+        }
+
+        # Add optional fields
+        if request.get("description"):
+            issue_data["fields"]["description"] = {
+                "type": "doc",
+                "version": 1,
+                "content": [
+                    {
+                        "type": "paragraph",
+                        "content": [
+                            {"type": "text", "text": request["description"]}
+                        ]
+                    }
+                ]
+            }
+
+        if request.get("assignee_id"):
+            issue_data["fields"]["assignee"] = {"accountId": request["assignee_id"]}
+
+        if request.get("labels"):
+            issue_data["fields"]["labels"] = request["labels"]
+
+        return issue_data
+
+    def validate_issue_request(self, request: dict) -> Dict[str, Any]:
+        """
+        Check a create request and build its Jira payload
+
+        Raises:
+            InvalidIssueRequestError: A required field is missing or malformed
+        """
+        try:
+            return self._build_issue_data(request)
+        except (KeyError, TypeError, AttributeError) as e:
+            raise InvalidIssueRequestError(f"Invalid issue request: missing or malformed {e}") from e
+
     async def create_issue(
         self,
         connection_id: str,
@@ -217,48 +841,137 @@ class JiraService:
         Returns:
             Created issue response
         """
-        try:
-            endpoint = f"/ex/jira/{cloud_id}/rest/api/3/issue"
-            
-            # Build issue data
-            issue_data: Dict[str, Any] = {
-                "fields": {
-                    "project": {"key": request["projectKey"]},
-                    "summary": request["summary"],
-                    "issuetype": {"name": request["issueType"]}
-                }
-            }
+        endpoint = f"/ex/jira/{cloud_id}/rest/api/3/issue"
+        issue_data = self.validate_issue_request(request)
 
-            # Add optional fields
-            if request.get("description"):
-                issue_data["fields"]["description"] = {
-                    "type": "doc",
-                    "version": 1,
-                    "content": [
-                        {
-                            "type": "paragraph",
-                            "content": [
-                                {"type": "text", "text": request["description"]}
-                            ]
-                        }
-                    ]
-                }
-
-            if request.get("assignee_id"):
-                issue_data["fields"]["assignee"] = {"accountId": request["assignee_id"]}
-
-            if request.get("labels"):
-                issue_data["fields"]["labels"] = request["labels"]
-            
+        try:
             data = await nango_service.proxy_post(connection_id, endpoint, issue_data)
+        finally:
+            # Also after a failure: a create that timed out may still have landed
+            self.invalidate_project(connection_id, request["projectKey"])
 
-            return {
-                "id": data["id"],
-                "key": data["key"],
-                "self_url": data["self"]
-            }
-        except Exception:
-            raise
+        return {
+            "id": data["id"],
+            "key": data["key"],
+            "self_url": data["self"]
+        }
+
+    @staticmethod
+    def _bulk_failure(index: int, error: Any, status: str = "failed") -> dict:
+        """Bulk create result for an item that was not (or may not have been) created"""
+        return {"index": index, "success": False, "status": status, "error": error}
+
+    async def _create_issue_chunk(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        chunk: List[tuple]
+    ) -> List[dict]:
+        """Send one /issue/bulk request and map its outcome back onto the chunk's items"""
+        endpoint = f"/ex/jira/{cloud_id}/rest/api/3/issue/bulk"
+        try:
+            data = await nango_service.proxy_post(
+                connection_id,
+                endpoint,
+                {"issueUpdates": [issue_data for _, issue_data in chunk]}
+            )
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code >= 500:
+                # Usually a gateway timeout while Jira was still creating them
+                error = f"Jira or Nango failed mid-request, the issues may or may not have been created: {e}"
+                return [self._bulk_failure(index, error, status="unknown") for index, _ in chunk]
+            # Jira answers 400 when every element failed, with the same error shape
+            try:
+                data = e.response.json()
+            except ValueError:
+                data = {}
+            if not data.get("errors"):
+                return [self._bulk_failure(index, str(e)) for index, _ in chunk]
+        except Exception as e:
+            if may_have_been_sent(e):
+                # Jira may have created some or all of them; a blind retry could duplicate them
+                error = f"No answer from Jira, the issues may or may not have been created: {e}"
+                return [self._bulk_failure(index, error, status="unknown") for index, _ in chunk]
+            return [self._bulk_failure(index, str(e)) for index, _ in chunk]
+
+        errors = {}
+        for error in data.get("errors", []):
+            element_errors = error.get("elementErrors", {})
+            errors[error.get("failedElementNumber")] = (
+                element_errors.get("errors") or element_errors.get("errorMessages") or error
+            )
+
+        # Created issues are listed in request order, skipping the failed elements
+        created = iter(data.get("issues", []))
+        results = []
+        for position, (index, _) in enumerate(chunk):
+            if position in errors:
+                results.append(self._bulk_failure(index, errors[position]))
+                continue
+            issue = next(created, None)
+            if issue is None:
+                results.append(self._bulk_failure(index, "Missing from Jira response"))
+            else:
+                results.append({
+                    "index": index,
+                    "success": True,
+                    "status": "created",
+                    "id": issue["id"],
+                    "key": issue["key"],
+                    "self_url": issue["self"]
+                })
+        return results
+
+    async def create_issues_bulk(
+        self,
+        connection_id: str,
+        cloud_id: str,
+        requests: List[dict]
+    ) -> List[dict]:
+        """
+        Create many Jira issues through /issue/bulk
+
+        Requests are split into chunks of JIRA_BULK_CHUNK_SIZE (Jira's limit is
+        50) and the chunks are sent concurrently, bounded by JIRA_MAX_CONCURRENCY.
+
+        Args:
+            connection_id: Nango connection ID
+            cloud_id: Jira Cloud ID
+            requests: Issue creation requests, same shape as create_issue
+
+        Returns:
+            One result per request, in input order, with "success", a
+            "status" (created, failed, or unknown when its chunk may have
+            reached Jira unanswered) and either the created id/key/self_url
+            or an "error"
+        """
+        results: Dict[int, dict] = {}
+        prepared = []
+        for index, request in enumerate(requests):
+            try:
+                prepared.append((index, self._build_issue_data(request)))
+            except (KeyError, TypeError, AttributeError, InvalidIssueRequestError) as e:
+                results[index] = self._bulk_failure(index, f"Invalid request: {e}")
+
+        size = settings.jira_bulk_chunk_size
+        chunks = [prepared[i:i + size] for i in range(0, len(prepared), size)]
+        try:
+            chunk_results = await gather_limited(
+                (self._create_issue_chunk(connection_id, cloud_id, chunk) for chunk in chunks),
+                settings.jira_max_concurrency
+            )
+        finally:
+            # Must not mask the per-item results (some issues may already exist)
+            for project_key in {data["fields"]["project"]["key"] for _, data in prepared}:
+                try:
+                    self.invalidate_project(connection_id, project_key)
+                except Exception as e:
+                    print(f"Could not invalidate cached queries for {project_key!r}: {e}")
+        for chunk_result in chunk_results:
+            for result in chunk_result:
+                results[result["index"]] = result
+
+        return [results[index] for index in range(len(requests))]
 
 
 # Singleton instance
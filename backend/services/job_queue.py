@@ -0,0 +1,342 @@
+"""
+MongoDB-backed job queue for work that should not hold an HTTP request open
+"""
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+import httpx
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from config import get_settings
+from services.nango_service import nango_service
+from services.jira_service import jira_service
+from services.rate_limiter import UpstreamBusyError, backoff_delay, parse_retry_after
+from services.metrics import MONGO_LATENCY
+
+settings = get_settings()
+
+# Seconds running jobs get to finish on shutdown before they are cancelled
+SHUTDOWN_GRACE_SECONDS = 10.0
+
+# Transport errors raised before the request reached Jira (safe to retry a create)
+_NOT_SENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+class IdempotencyConflictError(Exception):
+    """An Idempotency-Key was reused with a different request body"""
+
+    def __init__(self, idempotency_key: str):
+        super().__init__(f"Idempotency-Key {idempotency_key!r} was already used for a different request")
+        self.idempotency_key = idempotency_key
+
+
+class JobQueue:
+    """
+    Runs issue-creation jobs stored in the `jobs` collection
+
+    Jobs are claimed with a lease (JOB_LEASE_SECONDS) by a fixed pool of
+    workers (JOB_WORKERS). A job whose worker died, e.g. on a restart, is
+    picked up again once its lease expires; since Jira has no idempotent
+    create, a job interrupted mid-request may at worst create its issue twice.
+    A job cancelled on shutdown is requeued only if its create was not sent
+    yet; otherwise it is failed, as its outcome is unknown.
+    Throttling and connection failures are retried with backoff up to
+    JOB_MAX_ATTEMPTS; other errors fail the job. Lost leases count as
+    attempts too, so a job that keeps killing its worker ends up failed.
+    """
+
+    def __init__(self):
+        self.db = None
+        self._workers: List[asyncio.Task] = []
+        # Created in startup() so it belongs to the serving event loop
+        self._wake: Optional[asyncio.Event] = None
+        self._stopping = False
+
+    async def startup(self, db) -> None:
+        """Bind the database, create the jobs indexes and start the workers"""
+        self.db = db
+        self._stopping = False
+        self._wake = asyncio.Event()
+        await self.ensure_indexes()
+        self._workers = [
+            asyncio.create_task(self._work_forever()) for _ in range(max(1, settings.job_workers))
+        ]
+
+    async def shutdown(self) -> None:
+        """Let running jobs finish (briefly), then cancel the workers"""
+        self._stopping = True
+        if self._wake is not None:
+            self._wake.set()
+        workers, self._workers = self._workers, []
+        if not workers:
+            return
+        _, pending = await asyncio.wait(workers, timeout=SHUTDOWN_GRACE_SECONDS)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    async def ensure_indexes(self) -> None:
+        """Idempotency lookups, job claiming and expiry of finished jobs"""
+        await self.db.jobs.create_index(
+            [("connection_id", ASCENDING), ("idempotency_key", ASCENDING)],
+            unique=True,
+            partialFilterExpression={"idempotency_key": {"$type": "string"}},
+            name="idempotency_key_unique"
+        )
+        await self.db.jobs.create_index([("status", ASCENDING), ("run_after", ASCENDING)])
+        await self.db.jobs.create_index([("status", ASCENDING), ("locked_until", ASCENDING)])
+        await self.db.jobs.create_index(
+            [("finished_at", ASCENDING)],
+            expireAfterSeconds=settings.job_retention_seconds,
+            name="finished_at_ttl"
+        )
+
+    async def enqueue(
+        self,
+        connection_id: str,
+        payload: Dict[str, Any],
+        idempotency_key: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Store an issue-creation job, or return the one stored under the same key
+
+        Args:
+            connection_id: The Nango connection identifier
+            payload: Issue creation details (as for POST /api/issues/{id})
+            idempotency_key: Client-chosen key; retries with the same key and
+                body return the original job instead of creating another
+
+        Returns:
+            (job document, whether it was created by this call)
+
+        Raises:
+            IdempotencyConflictError: The key was used with a different body
+        """
+        if idempotency_key:
+            existing = await self._find_by_key(connection_id, idempotency_key)
+            if existing:
+                return self._replayed(existing, payload, idempotency_key), False
+
+        now = datetime.utcnow()
+        job = {
+            "_id": uuid.uuid4().hex,
+            "type": "create_issue",
+            "connection_id": connection_id,
+            "payload": payload,
+            "status": "queued",
+            "attempts": 0,
+            "run_after": now,
+            "created_at": now,
+            "updated_at": now
+        }
+        if idempotency_key:
+            job["idempotency_key"] = idempotency_key
+
+        try:
+            with MONGO_LATENCY.time("jobs.insert_one"):
+                await self.db.jobs.insert_one(job)
+        except DuplicateKeyError:
+            # A concurrent retry with the same key won the insert
+            existing = await self._find_by_key(connection_id, idempotency_key)
+            if existing is None:
+                raise
+            return self._replayed(existing, payload, idempotency_key), False
+
+        if self._wake is not None:
+            self._wake.set()
+        return job, True
+
+    async def _find_by_key(self, connection_id: str, idempotency_key: str) -> Optional[Dict[str, Any]]:
+        with MONGO_LATENCY.time("jobs.find_one"):
+            return await self.db.jobs.find_one(
+                {"connection_id": connection_id, "idempotency_key": idempotency_key}
+            )
+
+    @staticmethod
+    def _replayed(job: Dict[str, Any], payload: Dict[str, Any], idempotency_key: str) -> Dict[str, Any]:
+        if job.get("payload") != payload:
+            raise IdempotencyConflictError(idempotency_key)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch a job document by id"""
+        with MONGO_LATENCY.time("jobs.find_one"):
+            return await self.db.jobs.find_one({"_id": job_id})
+
+    @staticmethod
+    def job_status(job: Dict[str, Any]) -> Dict[str, Any]:
+        """Public view of a job for GET /api/jobs/{job_id}"""
+        result = job.get("result")
+        status = {
+            "job_id": job["_id"],
+            "type": job.get("type"),
+            "status": job["status"],
+            "connection_id": job["connection_id"],
+            "attempts": job.get("attempts", 0),
+            "key": result.get("key") if result else None,
+            "result": result,
+            "error": job.get("error"),
+        }
+        for field in ("created_at", "updated_at", "finished_at"):
+            value = job.get(field)
+            status[field] = value.isoformat() + "Z" if value else None
+        return status
+
+    async def _work_forever(self) -> None:
+        while not self._stopping:
+            # Cleared before claiming so an enqueue racing with an empty
+            # claim still wakes a worker
+            self._wake.clear()
+            try:
+                job = await self._claim()
+            except Exception as e:
+                print(f"Claiming a job failed: {e}")
+                job = None
+
+            if job is None:
+                try:
+                    await self._fail_abandoned()
+                except Exception as e:
+                    print(f"Failing abandoned jobs failed: {e}")
+                try:
+                    await asyncio.wait_for(self._wake.wait(), settings.job_poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            try:
+                await self._run(job)
+            except asyncio.CancelledError:
+                # Only requeues jobs cancelled before their create was sent;
+                # _run already failed the others, so the lease guard skips them
+                await asyncio.shield(self._release(job))
+                raise
+            except Exception as e:
+                print(f"Job {job['_id']} crashed: {e}")
+
+    async def _claim(self) -> Optional[Dict[str, Any]]:
+        """
+        Atomically lease the oldest runnable job (queued, or running with an
+        expired lease and attempts left)
+        """
+        now = datetime.utcnow()
+        with MONGO_LATENCY.time("jobs.find_one_and_update"):
+            return await self.db.jobs.find_one_and_update(
+                {"$or": [
+                    {"status": "queued", "run_after": {"$lte": now}},
+                    {
+                        "status": "running",
+                        "locked_until": {"$lte": now},
+                        "attempts": {"$lt": settings.job_max_attempts}
+                    }
+                ]},
+                {
+                    "$set": {
+                        "status": "running",
+                        "locked_until": now + timedelta(seconds=settings.job_lease_seconds),
+                        "updated_at": now
+                    },
+                    "$inc": {"attempts": 1}
+                },
+                sort=[("created_at", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+
+    async def _fail_abandoned(self) -> None:
+        """Fail jobs whose lease expired on their last allowed attempt (e.g. a job that keeps crashing its worker)"""
+        now = datetime.utcnow()
+        with MONGO_LATENCY.time("jobs.update_many"):
+            await self.db.jobs.update_many(
+                {
+                    "status": "running",
+                    "locked_until": {"$lte": now},
+                    "attempts": {"$gte": settings.job_max_attempts}
+                },
+                {
+                    "$set": {
+                        "status": "failed",
+                        "finished_at": now,
+                        "updated_at": now,
+                        "error": "Lease expired on the last attempt; the worker running the job was lost"
+                    },
+                    "$unset": {"locked_until": ""}
+                }
+            )
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        connection_id = job["connection_id"]
+        try:
+            cloud_id = await nango_service.get_cloud_id(connection_id)
+            if not cloud_id:
+                raise ValueError("Could not get Jira Cloud ID")
+            try:
+                result = await jira_service.create_issue(connection_id, cloud_id, job["payload"])
+            except asyncio.CancelledError:
+                await asyncio.shield(self._abandon(job))
+                raise
+        except Exception as e:
+            retry_after = self._retry_delay(e, job.get("attempts", 1))
+            if retry_after is not None and job.get("attempts", 1) < settings.job_max_attempts:
+                await self._update(job, {
+                    "status": "queued",
+                    "run_after": datetime.utcnow() + timedelta(seconds=retry_after),
+                    "error": f"{type(e).__name__}: {e}"
+                })
+            else:
+                await self._finish(job, "failed", error=f"{type(e).__name__}: {e}")
+            return
+
+        await self._finish(job, "succeeded", result=result)
+
+    @staticmethod
+    def _retry_delay(error: Exception, attempts: int) -> Optional[float]:
+        """Seconds to wait before retrying, or None if the error is final"""
+        backoff = backoff_delay(attempts - 1, settings.upstream_backoff_base, settings.upstream_backoff_max)
+        if isinstance(error, UpstreamBusyError):
+            return max(error.retry_after, backoff)
+        if isinstance(error, _NOT_SENT_ERRORS):
+            return backoff
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+            # Rejected without being processed, so a retry cannot duplicate it
+            return max(parse_retry_after(error.response.headers.get("Retry-After")) or 0.0, backoff)
+        return None
+
+    async def _finish(self, job: Dict[str, Any], status: str, **fields: Any) -> None:
+        now = datetime.utcnow()
+        await self._update(job, {"status": status, "finished_at": now, **fields}, unset_error=status == "succeeded")
+
+    async def _abandon(self, job: Dict[str, Any]) -> None:
+        """Fail a job cancelled while its create may already have reached Jira"""
+        try:
+            await self._finish(
+                job, "failed",
+                error="Interrupted by shutdown while creating the issue; it may or may not have been created"
+            )
+        except Exception as e:
+            print(f"Could not fail interrupted job {job['_id']}: {e}")
+
+    async def _release(self, job: Dict[str, Any]) -> None:
+        """Hand an interrupted job back to the queue without waiting out its lease"""
+        try:
+            await self._update(job, {"status": "queued", "run_after": datetime.utcnow()})
+        except Exception as e:
+            print(f"Could not release job {job['_id']}: {e}")
+
+    async def _update(self, job: Dict[str, Any], fields: Dict[str, Any], unset_error: bool = False) -> None:
+        update: Dict[str, Any] = {
+            "$set": {**fields, "updated_at": datetime.utcnow()},
+            "$unset": {"locked_until": ""}
+        }
+        if unset_error:
+            update["$unset"]["error"] = ""
+        with MONGO_LATENCY.time("jobs.update_one"):
+            # Guarded by the lease so a worker that lost it cannot overwrite the new owner
+            await self.db.jobs.update_one(
+                {"_id": job["_id"], "status": "running", "locked_until": job["locked_until"]},
+                update
+            )
+
+
+# Singleton instance
+job_queue = JobQueue()
@@ -0,0 +1,195 @@
+"""
+Live issue feed: one shared Jira poller per (connection, project), fanned out to subscribers
+"""
+import asyncio
+import math
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+from config import get_settings
+from services.admission import detached_context
+from services.jira_service import jira_service
+from services.metrics import registry
+
+settings = get_settings()
+
+# Relative JQL dates have minute granularity; the overlap absorbs truncation
+# and issues seen in the previous poll are filtered out by their `updated`
+_OVERLAP_MINUTES = 1
+
+
+class Subscriber:
+    """
+    One client of a feed channel with a bounded event queue
+
+    The poller never waits on a subscriber. When the queue is full, further
+    events are dropped and the subscriber is marked as lagging; once it has
+    drained its queue it receives a single `resync` event telling it to
+    reload the list instead of replaying what it missed.
+    """
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.lagging = False
+        self.dropped = 0
+
+    def publish(self, event: Optional[Tuple[str, Any]]) -> None:
+        if event is None:
+            # Channel closed: make room for the end-of-stream marker
+            while self.queue.full():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return
+        if self.queue.full():
+            self.lagging = True
+            self.dropped += 1
+            return
+        self.queue.put_nowait(event)
+
+    async def next_event(self, timeout: float) -> Optional[Tuple[str, Any]]:
+        """
+        Next event to send; ("resync", ...) after lagging, ("heartbeat", None)
+        when nothing happened within `timeout`, None once the feed is closed
+        """
+        if self.lagging and self.queue.empty():
+            self.lagging = False
+            dropped, self.dropped = self.dropped, 0
+            return "resync", {"dropped": dropped}
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return "heartbeat", None
+
+
+class FeedChannel:
+    """Poller state for one (connection, project) and its subscribers"""
+
+    def __init__(self, connection_id: str, cloud_id: str, project_key: str):
+        self.connection_id = connection_id
+        self.cloud_id = cloud_id
+        self.project_key = project_key
+        self.subscribers: Set[Subscriber] = set()
+        self.task: Optional[asyncio.Task] = None
+        # Issue id -> `updated` of the issues returned by the last poll
+        self._seen: Dict[str, str] = {}
+        self._last_poll: Optional[datetime] = None
+
+    def publish(self, event: Optional[Tuple[str, Any]]) -> None:
+        for subscriber in list(self.subscribers):
+            subscriber.publish(event)
+
+    async def poll(self) -> List[Any]:
+        """Fetch issues updated since the last poll and return the ones that changed"""
+        started_at = datetime.utcnow()
+        minutes = _OVERLAP_MINUTES
+        if self._last_poll:
+            elapsed = (started_at - self._last_poll).total_seconds() / 60
+            minutes += math.ceil(elapsed)
+
+        issues = []
+        pages = jira_service.iter_issue_pages(
+            self.connection_id,
+            self.cloud_id,
+            project_key=self.project_key,
+            jql=f'updated >= "-{minutes}m"'
+        )
+        try:
+            async for page in pages:
+                issues.extend(page)
+        finally:
+            await pages.aclose()
+
+        changed = [issue for issue in issues if self._seen.get(issue.id) != issue.updated_at]
+        self._seen = {issue.id: issue.updated_at for issue in issues}
+        self._last_poll = started_at
+        return changed
+
+    async def run(self) -> None:
+        """Poll until cancelled (when the last subscriber leaves)"""
+        primed = False
+        failures = 0
+        while True:
+            try:
+                changed = await self.poll()
+                failures = 0
+                if changed:
+                    # Cached queries for the project no longer match Jira
+                    jira_service.invalidate_project(self.connection_id, self.project_key)
+                if primed:
+                    for issue in changed:
+                        self.publish(("issue", issue))
+                primed = True
+                delay = settings.live_feed_poll_interval
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                failures += 1
+                print(f"Live feed poll for {self.connection_id}/{self.project_key} failed: {e}")
+                self.publish(("error", {"detail": str(e)}))
+                delay = min(settings.live_feed_poll_interval * 2 ** failures, 300)
+            await asyncio.sleep(delay)
+
+
+class LiveFeed:
+    """
+    Shares one Jira poller per (connection, project) between all subscribers
+
+    The poller starts with the first subscriber, asks Jira only for issues
+    updated since its previous poll (an incremental `updated >=` query) and
+    publishes each new or changed issue to every subscriber. It stops when
+    the last subscriber leaves. The first poll only records the current
+    state; subscribers load the list itself through GET /api/issues.
+    Deletions are not visible to the query and are not published.
+    """
+
+    def __init__(self):
+        self._channels: Dict[Tuple[str, str], FeedChannel] = {}
+
+    def subscribe(self, connection_id: str, cloud_id: str, project_key: str) -> Tuple[FeedChannel, Subscriber]:
+        """Join (or start) the channel for a project"""
+        # Project keys match case-insensitively; one channel serves every spelling
+        project_key = project_key.upper()
+        key = (connection_id, project_key)
+        channel = self._channels.get(key)
+        if channel is None:
+            channel = FeedChannel(connection_id, cloud_id, project_key)
+            channel.task = detached_context().run(asyncio.create_task, channel.run())
+            self._channels[key] = channel
+        subscriber = Subscriber(settings.live_feed_queue_size)
+        channel.subscribers.add(subscriber)
+        return channel, subscriber
+
+    def unsubscribe(self, channel: FeedChannel, subscriber: Subscriber) -> None:
+        """Leave a channel, stopping its poller if nobody is left"""
+        channel.subscribers.discard(subscriber)
+        if channel.subscribers:
+            return
+        if self._channels.get((channel.connection_id, channel.project_key)) is channel:
+            del self._channels[(channel.connection_id, channel.project_key)]
+        if channel.task is not None:
+            channel.task.cancel()
+
+    async def shutdown(self) -> None:
+        """Stop every poller and end the open streams"""
+        channels = list(self._channels.values())
+        self._channels.clear()
+        for channel in channels:
+            channel.publish(None)
+            channel.task.cancel()
+        await asyncio.gather(*(channel.task for channel in channels), return_exceptions=True)
+
+    def subscriber_counts(self) -> Dict[Tuple[str, ...], float]:
+        return {
+            (channel.connection_id, channel.project_key): len(channel.subscribers)
+            for channel in self._channels.values()
+        }
+
+
+# Singleton instance
+live_feed = LiveFeed()
+
+registry.gauge(
+    "live_feed_subscribers",
+    "Clients subscribed to a live issue feed (one upstream poller per series)",
+    ("connection_id", "project_key"),
+    callback=live_feed.subscriber_counts
+)
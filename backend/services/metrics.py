@@ -0,0 +1,228 @@
+"""
+Lightweight in-process metrics rendered in the Prometheus text format
+
+Metrics are plain dicts keyed by label values, so recording is a couple of
+dict operations and safe to leave on in production. Everything runs on the
+event loop thread, so no locking is needed.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from cache hits to slow upstream calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonically increasing count per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def value(self, *labelvalues: str) -> float:
+        return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> Iterator[str]:
+        for labelvalues, value in self._values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Gauge:
+    """Value that goes up and down, or is computed at scrape time by a callback"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Dict[Tuple[str, ...], float]]] = None
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, *labelvalues: str) -> None:
+        self._values[labelvalues] = value
+
+    def inc(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) + amount
+
+    def dec(self, *labelvalues: str, amount: float = 1.0) -> None:
+        self._values[labelvalues] = self._values.get(labelvalues, 0.0) - amount
+
+    def samples(self) -> Iterator[str]:
+        values = self.callback() if self.callback else self._values
+        for labelvalues, value in values.items():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class Histogram:
+    """Bucketed distribution of observed values (e.g. latencies in seconds)"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labelvalues: str) -> None:
+        state = self._values.get(labelvalues)
+        if state is None:
+            state = [0.0] * (len(self.buckets) + 2)
+            self._values[labelvalues] = state
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    @contextmanager
+    def time(self, *labelvalues: str) -> Iterator[None]:
+        """Observe the duration of the with-block"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, *labelvalues)
+
+    def samples(self) -> Iterator[str]:
+        for labelvalues, state in self._values.items():
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, labelvalues, le)} {_format_value(cumulative)}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(state[-1])}"
+            yield f"{self.name}_count{labels} {_format_value(cumulative)}"
+
+
+class Registry:
+    """Collection of metrics rendered together at /metrics"""
+
+    def __init__(self):
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+# Shared registry and the metrics recorded by the app
+registry = Registry()
+
+HTTP_REQUESTS = registry.counter(
+    "http_requests_total", "API requests by route and status", ("method", "route", "status")
+)
+HTTP_LATENCY = registry.histogram(
+    "http_request_duration_seconds", "API request latency by route", ("method", "route")
+)
+HTTP_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "API requests currently being handled"
+)
+RESPONSE_BYTES = registry.counter(
+    "http_response_bytes_saved_total",
+    "Response body bytes not sent thanks to 304s (not_modified) or compression (compression_saved)",
+    ("reason",)
+)
+ADMISSION_SHED = registry.counter(
+    "admission_shed_total",
+    "API requests rejected with 503 instead of admitted (queue_full, connection_queue_full, queue_timeout)",
+    ("reason",)
+)
+ADMISSION_WAIT = registry.histogram(
+    "admission_wait_seconds", "Time API requests spent queued for an admission slot"
+)
+DEADLINE_EXCEEDED = registry.counter(
+    "request_deadline_exceeded_total", "Upstream calls abandoned because the request deadline passed", ("operation",)
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "upstream_requests_total", "Nango/Jira responses by operation and status code", ("operation", "status")
+)
+UPSTREAM_LATENCY = registry.histogram(
+    "upstream_request_duration_seconds", "Latency of single Nango/Jira requests", ("operation",)
+)
+UPSTREAM_IN_FLIGHT = registry.gauge(
+    "upstream_requests_in_flight", "Nango/Jira requests currently on the wire", ("operation",)
+)
+UPSTREAM_RETRIES = registry.counter(
+    "upstream_retries_total", "Upstream requests retried after throttling or errors", ("operation", "reason")
+)
+UPSTREAM_COALESCED = registry.counter(
+    "upstream_coalesced_total", "Proxy GETs served by joining an identical in-flight request"
+)
+MONGO_LATENCY = registry.histogram(
+    "mongo_operation_duration_seconds", "Latency of MongoDB operations", ("operation",)
+)
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total", "Cache lookups by cache and result (hit/miss)", ("cache", "result")
+)
+
+
+def _cache_hit_ratios() -> Dict[Tuple[str, ...], float]:
+    lookups: Dict[str, List[float]] = {}
+    for (cache, result), count in CACHE_REQUESTS._values.items():
+        hits_total = lookups.setdefault(cache, [0.0, 0.0])
+        hits_total[1] += count
+        if result == "hit":
+            hits_total[0] += count
+    return {(cache,): hits / total for cache, (hits, total) in lookups.items() if total}
+
+
+CACHE_HIT_RATIO = registry.gauge(
+    "cache_hit_ratio", "Share of cache lookups served from the cache", ("cache",), callback=_cache_hit_ratios
+)
@@ -1,12 +1,48 @@
 """
 Nango API service for authentication and proxy requests
 """
+import asyncio
+import time
 import httpx
-from typing import Any, Dict, Optional
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
 from config import get_settings
+from services.admission import DeadlineExceededError, time_remaining
+from services.cache import TTLCache
+from services.singleflight import SingleFlight
+from services.metrics import (
+    DEADLINE_EXCEEDED,
+    UPSTREAM_COALESCED,
+    UPSTREAM_IN_FLIGHT,
+    UPSTREAM_LATENCY,
+    UPSTREAM_REQUESTS,
+    UPSTREAM_RETRIES,
+    registry,
+)
+from services.rate_limiter import UpstreamScheduler, backoff_delay, parse_retry_after
 
 settings = get_settings()
 
+# Upstream statuses worth retrying for idempotent requests
+RETRYABLE_STATUSES = {429, 502, 503, 504}
+
+# Transport failures raised before any of the request was written
+_UNSENT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+
+def may_have_been_sent(error: BaseException) -> bool:
+    """
+    Whether a request that failed with error may still have reached the
+    upstream (e.g. a read timeout), as opposed to certainly not being sent
+
+    A deadline that ran out while waiting for the scheduler or before the
+    send counts as not sent; one that cut a send short is judged by the
+    timeout behind it.
+    """
+    if isinstance(error, DeadlineExceededError):
+        error = error.__cause__
+    return isinstance(error, httpx.TransportError) and not isinstance(error, _UNSENT_ERRORS)
+
 
 class NangoService:
     """Service for interacting with Nango API"""
@@ -15,7 +51,131 @@ class NangoService:
         self.base_url = settings.nango_host.rstrip("/")
         self.secret_key = settings.nango_secret_key
         self.provider_key = settings.nango_jira_provider_key
-        
+        self.connection_timeout = self._build_timeout(settings.nango_connection_timeout)
+        self.proxy_timeout = self._build_timeout(settings.nango_proxy_timeout)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._config_cache = TTLCache(
+            ttl=settings.connection_cache_ttl,
+            max_size=settings.connection_cache_max_size,
+            name="connection_config"
+        )
+        self._inflight_gets = SingleFlight(copy_results=True)
+        # Direct-to-Jira mode: connection_id -> (access token, expiry as epoch seconds);
+        # a None token marks a connection without a reusable one until the expiry
+        self.direct_mode = settings.jira_direct_mode
+        self.direct_base_url = settings.jira_direct_base_url.rstrip("/")
+        self._tokens: Dict[str, Tuple[Optional[str], float]] = {}
+        self._token_refreshes = SingleFlight()
+        self.scheduler = UpstreamScheduler(
+            rate=settings.upstream_rate,
+            burst=settings.upstream_burst,
+            max_queue=settings.upstream_max_queue
+        )
+
+    @staticmethod
+    def _build_timeout(operation_timeout: float) -> httpx.Timeout:
+        """Build a per-operation timeout sharing the pool-wide connect/pool limits"""
+        return httpx.Timeout(
+            operation_timeout,
+            connect=settings.nango_connect_timeout,
+            pool=settings.nango_pool_timeout
+        )
+
+    @staticmethod
+    def _bounded_timeout(operation: str, timeout: httpx.Timeout) -> httpx.Timeout:
+        """
+        Shrink a timeout to what is left of the current request's deadline
+
+        Raises:
+            DeadlineExceededError: If the deadline has already passed
+        """
+        remaining = time_remaining()
+        if remaining is None:
+            return timeout
+        if remaining <= 0:
+            DEADLINE_EXCEEDED.inc(operation)
+            raise DeadlineExceededError()
+        bounded = [
+            remaining if value is None else min(value, remaining)
+            for value in (timeout.connect, timeout.read, timeout.write, timeout.pool)
+        ]
+        return httpx.Timeout(connect=bounded[0], read=bounded[1], write=bounded[2], pool=bounded[3])
+
+    @staticmethod
+    def _within_deadline(delay: float) -> bool:
+        """Whether waiting `delay` seconds (before a retry) still leaves time for the request"""
+        remaining = time_remaining()
+        return remaining is None or delay < remaining
+
+    def _create_client(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> httpx.AsyncClient:
+        """Create a pooled client that keeps connections to the Nango host alive"""
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            transport=transport,
+            http2=settings.nango_http2,
+            limits=httpx.Limits(
+                max_connections=settings.nango_max_connections,
+                max_keepalive_connections=settings.nango_max_keepalive_connections,
+                keepalive_expiry=settings.nango_keepalive_expiry
+            ),
+            timeout=self.proxy_timeout
+        )
+
+    async def startup(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """
+        Create the shared HTTP client (called from the app lifespan)
+
+        Args:
+            transport: Optional transport override (the benchmarks route
+                requests to an in-process fake Nango this way)
+        """
+        if self._client is None:
+            self._client = self._create_client(transport)
+
+    async def shutdown(self) -> None:
+        """Close the shared HTTP client and release pooled connections"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """
+        The shared pooled client
+
+        Scripts that never run the app lifespan (e.g. debug_jira.py) get a
+        client created on first use and should call shutdown() when done.
+        """
+        if self._client is None:
+            self._client = self._create_client()
+        return self._client
+
+    async def _send(self, operation: str, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send one request on the shared client, recording latency and status metrics
+
+        Timeouts are capped by the request deadline (see services.admission);
+        a timeout that ran into it raises DeadlineExceededError.
+        """
+        kwargs["timeout"] = self._bounded_timeout(operation, kwargs.get("timeout", self.proxy_timeout))
+        UPSTREAM_IN_FLIGHT.inc(operation)
+        started = time.perf_counter()
+        status = "error"
+        try:
+            response = await self.client.request(method, url, **kwargs)
+            status = str(response.status_code)
+            return response
+        except httpx.TimeoutException as e:
+            remaining = time_remaining()
+            if remaining is not None and remaining <= 0:
+                DEADLINE_EXCEEDED.inc(operation)
+                raise DeadlineExceededError() from e
+            raise
+        finally:
+            UPSTREAM_IN_FLIGHT.dec(operation)
+            UPSTREAM_LATENCY.observe(time.perf_counter() - started, operation)
+            UPSTREAM_REQUESTS.inc(operation, status)
+
     def _get_headers(self) -> Dict[str, str]:
         """Get headers for Nango API requests"""
         return {
@@ -23,34 +183,44 @@ class NangoService:
             "Content-Type": "application/json",
         }
     
-    async def get_connection(self, connection_id: str) -> Optional[Dict[str, Any]]:
+    async def get_connection(
+        self,
+        connection_id: str,
+        force_refresh: bool = False
+    ) -> Optional[Dict[str, Any]]:
         """
         Get connection details from Nango
 
         Args:
             connection_id: The connection identifier
+            force_refresh: Ask Nango to refresh the OAuth token even if it
+                has not expired yet
 
         Returns:
             Connection details including credentials and config
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(
-                    f"{self.base_url}/connection/{connection_id}",
-                    headers=self._get_headers(),
-                    params={"provider_config_key": self.provider_key},
-                    timeout=10.0
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.TimeoutException:
-                raise
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                    return None
-                raise
-            except Exception:
+        params = {"provider_config_key": self.provider_key}
+        if force_refresh:
+            params["force_refresh"] = "true"
+        try:
+            response = await self._send(
+                "connection",
+                "GET",
+                f"/connection/{connection_id}",
+                headers=self._get_headers(),
+                params=params,
+                timeout=self.connection_timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.TimeoutException, DeadlineExceededError):
+            raise
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
                 return None
+            raise
+        except Exception:
+            return None
     
     async def proxy_get(
         self, 
@@ -69,19 +239,25 @@ class NangoService:
         Returns:
             API response data
         """
-        headers = self._get_headers()
-        headers["Connection-Id"] = connection_id
-        headers["Provider-Config-Key"] = self.provider_key
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/proxy{endpoint}",
-                headers=headers,
-                params=params or {},
-                timeout=30.0
-            )
-            response.raise_for_status()
-            return response.json()
+        # Identical concurrent GETs share one upstream request
+        key = (connection_id, endpoint, self._normalize_params(params))
+        if key in self._inflight_gets:
+            UPSTREAM_COALESCED.inc()
+        return await self._inflight_gets.do(
+            key,
+            lambda: self._proxy_request("GET", connection_id, endpoint, params=params)
+        )
+
+    @staticmethod
+    def _normalize_params(params: Optional[Dict[str, Any]]) -> tuple:
+        """Order-independent, hashable form of query params for request coalescing"""
+        if not params:
+            return ()
+        return tuple(sorted(
+            (str(k), tuple(map(str, v)) if isinstance(v, (list, tuple)) else str(v))
+            for k, v in params.items()
+            if v is not None
+        ))
     
     async def proxy_post(
         self,
@@ -102,21 +278,194 @@ class NangoService:
         Returns:
             API response data
         """
-        headers = self._get_headers()
-        headers["Connection-Id"] = connection_id
-        headers["Provider-Config-Key"] = self.provider_key
-        
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                f"{self.base_url}/proxy{endpoint}",
-                headers=headers,
-                json=data,
-                params=params or {},
-                timeout=30.0
-            )
+        return await self._proxy_request("POST", connection_id, endpoint, params=params, json=data)
+
+    async def _proxy_request(
+        self,
+        method: str,
+        connection_id: str,
+        endpoint: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        """
+        Send a proxy request through the per-connection scheduler
+
+        In direct mode (JIRA_DIRECT_MODE), Jira endpoints are called on
+        api.atlassian.com with the cached OAuth token, skipping the Nango
+        proxy hop; a 401 drops the token and falls back to the proxy.
+
+        A 429 pauses the whole connection for Retry-After and is retried for
+        any method, since Jira rejected it without processing it. 5xx
+        responses and transport errors are retried with jittered exponential
+        backoff for GETs only. Waiting for the scheduler and retries are
+        bounded by the request deadline, if one is set.
+        """
+        idempotent = method == "GET"
+        use_direct = self.direct_mode and endpoint.startswith("/ex/jira/")
+
+        attempt = 0
+        while True:
+            remaining = time_remaining()
+            if remaining is None:
+                await self.scheduler.acquire(connection_id)
+            else:
+                try:
+                    await asyncio.wait_for(self.scheduler.acquire(connection_id), max(0.0, remaining))
+                except asyncio.TimeoutError:
+                    DEADLINE_EXCEEDED.inc("scheduler")
+                    raise DeadlineExceededError() from None
+
+            token = await self._get_access_token(connection_id) if use_direct else None
+            if token:
+                operation = f"direct_{method.lower()}"
+                url = f"{self.direct_base_url}{endpoint}"
+                headers = {"Authorization": f"Bearer {token}", "Accept": "application/json"}
+            else:
+                operation = f"proxy_{method.lower()}"
+                url = f"/proxy{endpoint}"
+                headers = self._get_headers()
+                headers["Connection-Id"] = connection_id
+                headers["Provider-Config-Key"] = self.provider_key
+
+            try:
+                response = await self._send(
+                    operation,
+                    method,
+                    url,
+                    headers=headers,
+                    params=params or {},
+                    json=json,
+                    timeout=self.proxy_timeout
+                )
+            except httpx.TransportError:
+                delay = backoff_delay(attempt, settings.upstream_backoff_base, settings.upstream_backoff_max)
+                if not idempotent or attempt >= settings.upstream_max_retries or not self._within_deadline(delay):
+                    raise
+                UPSTREAM_RETRIES.inc(operation, "transport")
+                await asyncio.sleep(delay)
+                attempt += 1
+                continue
+
+            status = response.status_code
+            if token and status == 401:
+                # Token revoked or rotated early: expire it so the next call
+                # force-refreshes it, and send this one through Nango
+                self._tokens[connection_id] = (token, 0.0)
+                use_direct = False
+                UPSTREAM_RETRIES.inc(operation, "401")
+                continue
+
+            retryable = status == 429 or (idempotent and status in RETRYABLE_STATUSES)
+            if retryable and attempt < settings.upstream_max_retries:
+                delay = parse_retry_after(response.headers.get("Retry-After"))
+                if delay is None:
+                    delay = backoff_delay(attempt, settings.upstream_backoff_base, settings.upstream_backoff_max)
+                if delay <= settings.upstream_max_retry_after and self._within_deadline(delay):
+                    UPSTREAM_RETRIES.inc(operation, str(status))
+                    if status == 429:
+                        self.scheduler.pause(connection_id, delay)
+                    else:
+                        await asyncio.sleep(delay)
+                    attempt += 1
+                    continue
+
             response.raise_for_status()
             return response.json()
     
+    @staticmethod
+    def _parse_expiry(value: Any) -> float:
+        """Token expiry (ISO string or epoch) as epoch seconds; unknown means no caching"""
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                pass
+        return 0.0
+
+    async def _get_access_token(self, connection_id: str) -> Optional[str]:
+        """
+        Cached OAuth access token for direct-to-Jira calls
+
+        The token is refreshed through Nango once it is within
+        JIRA_TOKEN_REFRESH_MARGIN seconds of expiring; concurrent refreshes
+        for a connection are coalesced. Returns None when no usable token is
+        available, in which case callers use the proxy; that answer is cached
+        for JIRA_TOKEN_NEGATIVE_TTL seconds.
+        """
+        cached = self._tokens.get(connection_id)
+        if cached:
+            token, expires_at = cached
+            if token is None and expires_at > time.time():
+                return None
+            if token is not None and expires_at - settings.jira_token_refresh_margin > time.time():
+                return token
+        try:
+            return await self._token_refreshes.do(
+                connection_id,
+                lambda: self._refresh_access_token(connection_id, force=bool(cached and cached[0]))
+            )
+        except DeadlineExceededError:
+            return None
+        except Exception:
+            self._no_access_token(connection_id)
+            return None
+
+    def _no_access_token(self, connection_id: str) -> None:
+        """Send a connection's calls through the proxy for a while without asking Nango"""
+        self._tokens[connection_id] = (None, time.time() + settings.jira_token_negative_ttl)
+
+    async def _refresh_access_token(self, connection_id: str, force: bool) -> Optional[str]:
+        connection = await self.get_connection(connection_id, force_refresh=force)
+        if not connection:
+            self._no_access_token(connection_id)
+            return None
+        if connection.get("connection_config"):
+            self.cache_connection_config(connection_id, connection["connection_config"])
+
+        credentials = connection.get("credentials") or {}
+        token = credentials.get("access_token")
+        expires_at = self._parse_expiry(credentials.get("expires_at"))
+        if not token or expires_at - settings.jira_token_refresh_margin <= time.time():
+            # Not an OAuth token we can safely reuse; stay on the proxy
+            self._no_access_token(connection_id)
+            return None
+        self._tokens[connection_id] = (token, expires_at)
+        return token
+
+    async def _load_connection_config(self, connection_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch only the connection_config part of a Nango connection"""
+        connection = await self.get_connection(connection_id)
+        if connection and "connection_config" in connection:
+            return connection["connection_config"]
+        return None
+
+    async def get_connection_config(self, connection_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the connection configuration, served from the metadata cache
+
+        Args:
+            connection_id: The connection identifier
+
+        Returns:
+            The connection_config mapping (cloudId, accountId, ...) or None
+        """
+        return await self._config_cache.get_or_load(
+            connection_id,
+            lambda: self._load_connection_config(connection_id)
+        )
+
+    def cache_connection_config(self, connection_id: str, config: Dict[str, Any]) -> None:
+        """Prime the metadata cache with a freshly fetched connection_config"""
+        self._config_cache.set(connection_id, config)
+
+    def invalidate_connection(self, connection_id: str) -> None:
+        """Drop cached metadata and tokens for a connection (e.g. after re-registration)"""
+        self._config_cache.invalidate(connection_id)
+        self._tokens.pop(connection_id, None)
+
     async def get_cloud_id(self, connection_id: str) -> Optional[str]:
         """
         Get the Jira Cloud ID from connection configuration
@@ -127,9 +476,9 @@ class NangoService:
         Returns:
             The Jira Cloud ID or None
         """
-        connection = await self.get_connection(connection_id)
-        if connection and "connection_config" in connection:
-            return connection["connection_config"].get("cloudId")
+        config = await self.get_connection_config(connection_id)
+        if config:
+            return config.get("cloudId")
         return None
     
     async def get_account_id(self, connection_id: str) -> Optional[str]:
@@ -142,11 +491,18 @@ class NangoService:
         Returns:
             The Jira Account ID or None
         """
-        connection = await self.get_connection(connection_id)
-        if connection and "connection_config" in connection:
-            return connection["connection_config"].get("accountId")
+        config = await self.get_connection_config(connection_id)
+        if config:
+            return config.get("accountId")
         return None
 
 
 # Singleton instance
 nango_service = NangoService()
+
+registry.gauge(
+    "upstream_queue_depth",
+    "Upstream requests waiting on their connection's rate limit",
+    ("connection_id",),
+    callback=lambda: {(cid,): depth for cid, depth in nango_service.scheduler.queue_depths().items()}
+)
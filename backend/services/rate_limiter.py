@@ -0,0 +1,154 @@
+"""
+Per-connection scheduling of upstream (Nango proxy / Jira) requests
+"""
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+
+class UpstreamBusyError(Exception):
+    """Raised when a connection's upstream queue is full"""
+
+    def __init__(self, connection_id: str, retry_after: float):
+        super().__init__(f"Too many queued upstream requests for connection {connection_id}")
+        self.connection_id = connection_id
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """
+    Token bucket with a FIFO wait queue
+
+    Tokens refill at `rate` per second up to `capacity`. Waiters are served in
+    arrival order, and a 429 from upstream can pause the bucket for the
+    Retry-After period so the whole connection backs off, not just one call.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def is_idle(self, now: float) -> bool:
+        """Full, unpaused and unused: indistinguishable from a new bucket"""
+        return (
+            self.waiting == 0
+            and now >= self.paused_until
+            and self.tokens + (now - self.updated) * self.rate >= self.capacity
+        )
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request on this bucket for the given time"""
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        """Wait for a token"""
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self.paused_until:
+                        await asyncio.sleep(self.paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    await asyncio.sleep((1 - self.tokens) / self.rate)
+        finally:
+            self.waiting -= 1
+
+
+class UpstreamScheduler:
+    """
+    Admits upstream requests through one token bucket per connection
+
+    A burst from one tenant queues behind its own bucket instead of draining
+    the shared Jira quota, and is rejected once its queue is full.
+
+    Idle buckets (full, unpaused, no waiters) are dropped whenever the table
+    has doubled since the last sweep, so memory follows the connections in
+    use rather than every connection id ever seen.
+    """
+
+    # Smallest table size that triggers a sweep of idle buckets
+    MIN_PRUNE_SIZE = 64
+
+    def __init__(self, rate: float, burst: float, max_queue: int):
+        self.rate = rate
+        self.burst = burst
+        self.max_queue = max_queue
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._prune_at = self.MIN_PRUNE_SIZE
+
+    def _bucket(self, connection_id: str) -> TokenBucket:
+        bucket = self._buckets.get(connection_id)
+        if bucket is None:
+            if len(self._buckets) >= self._prune_at:
+                self.prune()
+            bucket = TokenBucket(self.rate, self.burst)
+            self._buckets[connection_id] = bucket
+        return bucket
+
+    def prune(self) -> int:
+        """Drop idle buckets; returns how many were dropped"""
+        now = time.monotonic()
+        idle = [cid for cid, bucket in self._buckets.items() if bucket.is_idle(now)]
+        for cid in idle:
+            del self._buckets[cid]
+        self._prune_at = max(self.MIN_PRUNE_SIZE, 2 * len(self._buckets))
+        return len(idle)
+
+    async def acquire(self, connection_id: str) -> None:
+        """
+        Wait for permission to send a request for a connection
+
+        Raises:
+            UpstreamBusyError: If the connection already has max_queue waiters
+        """
+        bucket = self._bucket(connection_id)
+        if bucket.waiting >= self.max_queue:
+            raise UpstreamBusyError(connection_id, retry_after=bucket.waiting / self.rate)
+        await bucket.acquire()
+
+    def pause(self, connection_id: str, seconds: float) -> None:
+        """Back off every request for a connection (after a 429)"""
+        self._bucket(connection_id).pause(seconds)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Number of requests currently waiting, per connection"""
+        return {cid: bucket.waiting for cid, bucket in self._buckets.items() if bucket.waiting}
+
+    def queue_depth(self) -> int:
+        """Total number of requests currently waiting"""
+        return sum(bucket.waiting for bucket in self._buckets.values())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
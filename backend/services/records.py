@@ -0,0 +1,98 @@
+"""
+Compact records returned by JiraService
+
+Records are slotted dataclasses: cheaper to build and hold than dicts, and
+serialised natively by orjson (see routes/responses.py) without going
+through FastAPI's jsonable_encoder. The field names are the API's JSON keys.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+import orjson
+
+
+class Record:
+    """Mixin giving slotted records a dict view (for MongoDB writes and the like)"""
+
+    __slots__ = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, Record):
+                value = value.to_dict()
+            elif isinstance(value, list):
+                value = [item.to_dict() if isinstance(item, Record) else item for item in value]
+            result[name] = value
+        return result
+
+
+class RecordList(list):
+    """
+    Result list that keeps its JSON encoding once computed
+
+    Used for results shared through caches, which callers must not modify:
+    every response serving the same cached list reuses one encoding (see
+    routes/responses.py).
+    """
+
+    __slots__ = ("_json",)
+
+    def json(self) -> bytes:
+        encoded = getattr(self, "_json", None)
+        if encoded is None:
+            encoded = orjson.dumps(self, option=orjson.OPT_NON_STR_KEYS)
+            self._json = encoded
+        return encoded
+
+
+@dataclass
+class CommentAuthor(Record):
+    __slots__ = ("accountId", "active", "displayName", "emailAddress")
+    accountId: Optional[str]
+    active: bool
+    displayName: str
+    emailAddress: Optional[str]
+
+
+@dataclass
+class Comment(Record):
+    __slots__ = ("id", "createdAt", "updatedAt", "author", "body")
+    id: Optional[str]
+    createdAt: Optional[str]
+    updatedAt: Optional[str]
+    author: CommentAuthor
+    body: Any
+
+
+@dataclass
+class IssueRecord(Record):
+    __slots__ = (
+        "id", "key", "summary", "issue_type", "status", "assignee", "url", "web_url",
+        "project_id", "project_key", "project_name", "created_at", "updated_at", "comments",
+    )
+    id: str
+    key: str
+    summary: str
+    issue_type: str
+    status: str
+    assignee: Optional[str]
+    url: str
+    web_url: str
+    project_id: str
+    project_key: str
+    project_name: str
+    created_at: str
+    updated_at: str
+    comments: List[Comment]
+
+
+@dataclass
+class ProjectRecord(Record):
+    __slots__ = ("id", "key", "name", "url", "project_type_key", "web_url")
+    id: str
+    key: str
+    name: str
+    url: str
+    project_type_key: str
+    web_url: str
@@ -0,0 +1,119 @@
+"""
+Coalescing of identical concurrent async calls
+"""
+import asyncio
+import contextvars
+import copy
+from typing import Any, Awaitable, Callable, Dict, Hashable
+from services.admission import DeadlineExceededError, SharedDeadline, request_deadline, time_remaining
+from services.metrics import DEADLINE_EXCEEDED
+
+
+class _Call:
+    """An in-flight call, its deadline and the number of callers still awaiting it"""
+
+    __slots__ = ("task", "deadline", "callers")
+
+    def __init__(self, deadline: SharedDeadline):
+        self.task: "asyncio.Task" = None
+        self.deadline = deadline
+        self.callers = 0
+
+
+class SingleFlight:
+    """
+    Runs at most one call per key at a time
+
+    Callers that arrive while a call for their key is in flight await the
+    same result instead of starting their own. The call runs in its own task,
+    so one caller being cancelled does not cancel it for the others, and an
+    exception is raised to every caller.
+
+    The call runs under the latest request deadline among the callers that
+    joined it (none if any caller has none), extended as callers join. Each
+    caller waits at most until its own deadline and then gets
+    DeadlineExceededError; once no caller is left waiting, the call is
+    cancelled.
+    """
+
+    def __init__(self, copy_results: bool = False):
+        # With copy_results, every caller of a shared call but the last to
+        # resume gets a deep copy, so none of them can mutate another's result
+        self.copy_results = copy_results
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    def __contains__(self, key: Hashable) -> bool:
+        call = self._calls.get(key)
+        return call is not None and not call.task.done()
+
+    def is_current(self, key: Hashable, task: "asyncio.Task") -> bool:
+        """Whether task is still the in-flight call for key (i.e. not forgotten)"""
+        call = self._calls.get(key)
+        return call is not None and call.task is task
+
+    def forget(self, key: Hashable) -> None:
+        """Let the next caller start a new call even if one is in flight"""
+        self._calls.pop(key, None)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Run fn for key, or join the call already in flight for key
+
+        Args:
+            key: Identity of the call
+            fn: Coroutine factory, only invoked if no call is in flight
+
+        Returns:
+            The call's result (a per-caller copy when shared and copy_results)
+
+        Raises:
+            DeadlineExceededError: The caller's request deadline passed first
+        """
+        call = self._calls.get(key)
+        if call is None or call.task.done():
+            call = _Call(SharedDeadline())
+            call.deadline.join(request_deadline.get())
+            context = contextvars.copy_context()
+            context.run(request_deadline.set, call.deadline)
+            call.task = context.run(asyncio.ensure_future, fn())
+            call.task.add_done_callback(lambda task: self._done(key, task))
+            self._calls[key] = call
+        else:
+            call.deadline.join(request_deadline.get())
+        call.callers += 1
+
+        remaining = time_remaining()
+        try:
+            if remaining is None:
+                result = await asyncio.shield(call.task)
+            else:
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(call.task), max(0.0, remaining))
+                except asyncio.TimeoutError:
+                    if call.task.done():
+                        raise
+                    DEADLINE_EXCEEDED.inc("coalesced")
+                    raise DeadlineExceededError() from None
+        finally:
+            call.callers -= 1
+            if call.callers == 0 and not call.task.done():
+                # Nobody is waiting for the result any more
+                if self._calls.get(key) is call:
+                    del self._calls[key]
+                call.task.cancel()
+        # Waiters resume one after another once the call is done; each copies
+        # the result before the next runs, and the last one takes the original
+        if self.copy_results and call.callers > 0:
+            return copy.deepcopy(result)
+        return result
+
+    def _done(self, key: Hashable, task: "asyncio.Task") -> None:
+        call = self._calls.get(key)
+        if call is not None and call.task is task:
+            del self._calls[key]
+        # Every caller may have been cancelled; don't warn about an unread error
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1 @@
+"""Recorded Jira webhook payloads and a script to replay them locally"""
@@ -0,0 +1,69 @@
+"""
+Replay recorded Jira webhook payloads against a running backend
+
+Each payload is signed with JIRA_WEBHOOK_SECRET (from .env) the way Jira
+signs deliveries (X-Hub-Signature: sha256=<HMAC of the body>) and POSTed to
+/api/webhooks/jira. With no files given, the bundled samples are sent in
+created -> updated -> deleted order.
+
+Usage (from backend/, with the API running):
+    python -m webhook_samples.replay --connection-id user-1
+    python -m webhook_samples.replay --connection-id user-1 webhook_samples/issue_updated.json
+"""
+import argparse
+import asyncio
+import os
+import sys
+from typing import List, Optional
+import httpx
+from config import get_settings
+from routes.webhook_routes import webhook_signature
+
+SAMPLES_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SAMPLES = ("issue_created.json", "issue_updated.json", "issue_deleted.json")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="POST recorded Jira webhook payloads to the backend")
+    parser.add_argument("files", nargs="*", help="Payload files (default: the bundled samples)")
+    parser.add_argument("--connection-id", required=True, help="Connection whose mirror receives the events")
+    parser.add_argument(
+        "--url",
+        default=f"http://localhost:{settings.api_port}/api/webhooks/jira",
+        help="Webhook endpoint"
+    )
+    parser.add_argument("--secret", default=settings.jira_webhook_secret, help="Signing secret (JIRA_WEBHOOK_SECRET)")
+    return parser.parse_args(argv)
+
+
+async def replay(args: argparse.Namespace) -> int:
+    files = args.files or [os.path.join(SAMPLES_DIR, name) for name in DEFAULT_SAMPLES]
+    failures = 0
+    async with httpx.AsyncClient(timeout=10) as client:
+        for path in files:
+            with open(path, "rb") as f:
+                body = f.read()
+            response = await client.post(
+                args.url,
+                params={"connection_id": args.connection_id},
+                content=body,
+                headers={
+                    "Content-Type": "application/json",
+                    "X-Hub-Signature": webhook_signature(args.secret, body)
+                }
+            )
+            print(f"{os.path.basename(path)}: HTTP {response.status_code} {response.text}")
+            failures += response.status_code >= 400
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    if not args.secret:
+        sys.exit("Set JIRA_WEBHOOK_SECRET (or pass --secret) to match the backend")
+    sys.exit(1 if asyncio.run(replay(args)) else 0)
+
+
+if __name__ == "__main__":
+    main()
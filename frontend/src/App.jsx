@@ -1,4 +1,4 @@
-import React, { useState, useEffect, useCallback } from 'react';
+import React, { useState, useEffect, useCallback, useRef } from 'react';
 import { RefreshCw, Plus, Search, Filter, LogOut } from 'lucide-react';
 import Header from './components/Header';
 import AuthScreen from './components/AuthScreen';
@@ -6,6 +6,9 @@ import IssuesList from './components/IssuesList';
 import CreateIssueModal from './components/CreateIssueModal';
 import { jiraApi } from './services/api';
 
+// Only the fields the issue list renders; the backend asks Jira for just these
+const ISSUE_LIST_FIELDS = 'summary,status,assignee,issue_type,created_at,web_url';
+
 function App() {
     const [connectionId, setConnectionId] = useState(localStorage.getItem('nango_connection_id'));
     const [connectionStatus, setConnectionStatus] = useState(null);
@@ -16,6 +19,8 @@ function App() {
     const [isModalOpen, setIsModalOpen] = useState(false);
     const [selectedProject, setSelectedProject] = useState('');
     const [searchQuery, setSearchQuery] = useState('');
+    // Set when the dashboard already delivered the issues for the initial render
+    const issuesPreloaded = useRef(false);
 
     const handleLogin = (id) => {
         localStorage.setItem('nango_connection_id', id);
@@ -30,43 +35,14 @@ function App() {
         setIssues([]);
     }, []);
 
-    const fetchConnectionStatus = useCallback(async () => {
-        if (!connectionId) return null;
-        try {
-            const { data } = await jiraApi.getConnectionStatus(connectionId);
-            setConnectionStatus(data);
-            if (!data.connected) {
-                handleLogout();
-            }
-            return data;
-        } catch (error) {
-            console.error('Failed to fetch status:', error);
-            handleLogout();
-            return null;
-        }
-    }, [connectionId, handleLogout]);
-
-    const fetchProjects = useCallback(async () => {
-        if (!connectionId) return;
-        try {
-            const { data } = await jiraApi.getProjects(connectionId);
-            setProjects(data);
-            if (data.length > 0 && !selectedProject) {
-                setSelectedProject(data[0].key);
-            }
-        } catch (error) {
-            console.error('Failed to fetch projects:', error);
-        }
-    }, [connectionId, selectedProject]);
-
     const fetchIssues = useCallback(async () => {
         if (!connectionId || !connectionStatus?.connected) return;
 
         setIssuesLoading(true);
         try {
-            const params = {};
+            const params = { fields: ISSUE_LIST_FIELDS };
             if (selectedProject) params.project_key = selectedProject;
-            if (searchQuery) params.jql = `summary ~ "${searchQuery}"`;
+            if (searchQuery) params.jql = `summary ~ "${searchQuery.replace(/["\\]/g, '\\$&')}"`;
 
             const { data } = await jiraApi.getIssues(connectionId, params);
             setIssues(data);
@@ -84,12 +60,32 @@ function App() {
         }
 
         setLoading(true);
-        const status = await fetchConnectionStatus();
-        if (status?.connected) {
-            await fetchProjects();
+        try {
+            // Issues come back for the first project, which becomes the selection
+            const { data } = await jiraApi.getDashboard(connectionId, { fields: ISSUE_LIST_FIELDS });
+            if (!data.connection?.connected) {
+                handleLogout();
+                return;
+            }
+            Object.entries(data.errors).forEach(([section, error]) =>
+                console.error(`Failed to fetch ${section}:`, error.detail)
+            );
+            setProjects(data.projects);
+            if (data.project_key) {
+                setSelectedProject(data.project_key);
+            }
+            if (!data.errors.issues) {
+                issuesPreloaded.current = true;
+                setIssues(data.issues);
+            }
+            setConnectionStatus(data.connection);
+        } catch (error) {
+            console.error('Failed to load dashboard:', error);
+            handleLogout();
+        } finally {
+            setLoading(false);
         }
-        setLoading(false);
-    }, [connectionId, fetchConnectionStatus, fetchProjects]);
+    }, [connectionId, handleLogout]);
 
     useEffect(() => {
         init();
@@ -97,10 +93,30 @@ function App() {
 
     useEffect(() => {
         if (connectionId && connectionStatus?.connected) {
+            if (issuesPreloaded.current) {
+                issuesPreloaded.current = false;
+                return;
+            }
             fetchIssues();
         }
     }, [connectionId, connectionStatus, selectedProject, fetchIssues]);
 
+    // Live updates for the selected project instead of re-fetching the list
+    useEffect(() => {
+        if (!connectionId || !connectionStatus?.connected || !selectedProject || searchQuery) return;
+
+        const source = jiraApi.subscribeIssues(connectionId, selectedProject);
+        source.addEventListener('issue', (event) => {
+            const issue = JSON.parse(event.data);
+            setIssues((current) => {
+                const rest = current.filter((existing) => existing.id !== issue.id);
+                return [issue, ...rest].sort((a, b) => (b.created_at || '').localeCompare(a.created_at || ''));
+            });
+        });
+        source.addEventListener('resync', () => fetchIssues());
+        return () => source.close();
+    }, [connectionId, connectionStatus, selectedProject, searchQuery, fetchIssues]);
+
     if (loading && connectionId) {
         return (
             <div style={{ height: '100vh', display: 'flex', alignItems: 'center', justifyContent: 'center', color: 'var(--text-secondary)' }}>
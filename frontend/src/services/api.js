@@ -10,11 +10,17 @@ const api = axios.create({
 
 export const jiraApi = {
     getConnectionStatus: (connectionId) => api.get(`/connection/${connectionId}`),
+    // Connection status, projects, issues and issue types in one round trip
+    getDashboard: (connectionId, params) => api.get(`/dashboard/${connectionId}`, { params }),
     saveConnection: (connectionId) => api.post('/connection', { connectionId }),
     getProjects: (connectionId) => api.get(`/projects/${connectionId}`),
     getIssues: (connectionId, params) => api.get(`/issues/${connectionId}`, { params }),
     getIssueTypes: (connectionId, projectId) => api.get(`/issue-types/${connectionId}/${projectId}`),
     createIssue: (connectionId, data) => api.post(`/issues/${connectionId}`, data),
+    // Server-Sent Events feed of issue changes (one shared upstream poller per project)
+    subscribeIssues: (connectionId, projectKey) => new EventSource(
+        `${api.defaults.baseURL}/issues/${connectionId}/live?project_key=${encodeURIComponent(projectKey)}`
+    ),
 };
 
 export default api;